@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import timeit
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from models.property import Property
+from models.listing_card import ListingCard
+from storage.database import Database
+
+CARD = dict(
+    property_id="ss_12345678",
+    title="იყიდება 3 ოთახიანი ბინა ვაკეში",
+    price=85000,
+    currency="USD",
+    location="ვაკე, თბილისი",
+    size=78.0,
+    rooms=3,
+    property_type="apartment",
+    source_url="https://home.ss.ge/ka/udzravi-qoneba/iyideba-bina?page=1",
+    detail_url="https://home.ss.ge/ka/udzravi-qoneba/iyideba-bina-12345678",
+    images=["https://static.ss.ge/20240101/1.jpg"]
+)
+
+def card_as_property():
+    prop = Property(**CARD)
+    return json.dumps(prop.to_dict(), ensure_ascii=False)
+
+def card_as_listing_card():
+    card = ListingCard(**CARD)
+    return json.dumps(card.to_row(), ensure_ascii=False)
+
+# save_property's row before ListingCard, as it was
+def row_previous(prop: Property) -> tuple:
+    data = prop.to_dict()
+    data['hash'] = prop.generate_hash()
+    return (
+        data['property_id'], data['title'], data['price'], data['currency'],
+        data['location'], data.get('district'), data.get('size'),
+        data.get('rooms'), data.get('bedrooms'), data.get('floor'),
+        data.get('total_floors'), data['property_type'], data.get('description'),
+        data['images'], data['source_url'], data.get('detail_url'),
+        data.get('listing_date'), data['scraped_at'], data['scraped_at'],
+        True, data['hash'], data.get('canonical_id')
+    )
+
+def measure(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+def run(number: int) -> dict:
+    prop = Property(**CARD)
+    db = Database.__new__(Database)
+    return {
+        'card_pydantic_us': measure(card_as_property, number),
+        'card_slots_us': measure(card_as_listing_card, number),
+        'row_previous_us': measure(lambda: row_previous(prop), number),
+        'row_current_us': measure(lambda: db._property_row(prop), number),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Per-card cost of the listing hot path')
+    parser.add_argument('--number', type=int, default=20000, help='Iterations per measurement')
+    args = parser.parse_args()
+    
+    results = run(args.number)
+    print(f"Listing card (build + checkpoint payload): {results['card_pydantic_us']:.2f} µs with Property, {results['card_slots_us']:.2f} µs with ListingCard")
+    print(f"Database row: {results['row_previous_us']:.2f} µs before, {results['row_current_us']:.2f} µs now")
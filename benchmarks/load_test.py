@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from main import HomeusManager
+from utils.metrics import stage_delta, stage_totals
+from mock_site import SITES, add_site_arguments, site_from_args
+
+def build_config(args, site, db_path: str) -> dict:
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    config['database']['path'] = db_path
+    config['logging'].update({'level': args.log_level, 'file': None})
+    config['google_sheets']['enabled'] = False
+    config['outbox']['enabled'] = False
+    config['notifications']['enabled'] = False
+    config.setdefault('images', {})['enabled'] = False
+    config.setdefault('metrics', {})['enabled'] = False
+    
+    scraping = config['scraping']
+    scraping['max_pages'] = args.max_pages
+    scraping['delay_between_requests'] = args.delay
+    scraping['timeout'] = args.timeout
+    scraping.setdefault('sharding', {})['enabled'] = args.sharding
+    config.setdefault('performance', {})['max_concurrent_requests'] = args.concurrency
+    
+    config['websites'] = {
+        name: {
+            'name': f"Mock {name}",
+            'base_url': site.base_url(name),
+            'enabled': True,
+            'search_urls': [{'url': site.search_url(name), 'name': f"Mock {name} apartments"}]
+        }
+        for name in SITES if name in args.sites
+    }
+    return config
+
+def count_rows(db_path: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM properties').fetchone()[0]
+
+def run_cycles(manager, site, db_path: str, cycles: int, pause: float) -> list:
+    reports = []
+    for cycle in range(1, cycles + 1):
+        requests_before = site.snapshot_stats()
+        rows_before = count_rows(db_path)
+        timings_before = stage_totals()
+        
+        started = time.perf_counter()
+        results = manager.run_scraping_cycle()
+        elapsed = time.perf_counter() - started
+        
+        requests_after = site.snapshot_stats()
+        served = {key: requests_after[key] - requests_before[key] for key in requests_after}
+        written = count_rows(db_path) - rows_before
+        report = {
+            'cycle': cycle,
+            'seconds': round(elapsed, 3),
+            'requests': served['requests'],
+            'requests_per_sec': round(served['requests'] / elapsed, 1),
+            'listing_pages': served['listing_pages'],
+            'detail_pages': served['detail_pages'],
+            'injected_errors': served['status_429'] + served['status_5xx'],
+            'new_properties': sum(results.values()),
+            'rows_written': written,
+            'rows_per_sec': round(written / elapsed, 1),
+            'stage_seconds': stage_delta(timings_before),
+        }
+        reports.append(report)
+        print(
+            f"cycle {cycle}: {report['seconds']}s, {report['requests']} requests "
+            f"({report['requests_per_sec']}/s, {report['injected_errors']} injected errors), "
+            f"{report['new_properties']} new, {report['rows_per_sec']} rows/s"
+        )
+        if cycle < cycles and pause:
+            time.sleep(pause)
+    return reports
+
+def summarize(reports: list) -> dict:
+    seconds = [report['seconds'] for report in reports]
+    total_seconds = sum(seconds)
+    return {
+        'cycles': len(reports),
+        'cycle_seconds_median': round(statistics.median(seconds), 3),
+        'cycle_seconds_max': max(seconds),
+        'requests_per_sec': round(sum(report['requests'] for report in reports) / total_seconds, 1),
+        'rows_per_sec': round(sum(report['rows_written'] for report in reports) / total_seconds, 1),
+        'new_properties': sum(report['new_properties'] for report in reports),
+        'injected_errors': sum(report['injected_errors'] for report in reports),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Run full scraping cycles against the local mock site')
+    add_site_arguments(parser)
+    parser.add_argument('--config', default=os.path.join(ROOT, 'config', 'config.example.yaml'),
+                        help='Base configuration; websites, storage and outputs are overridden')
+    parser.add_argument('--sites', default='ss,myhome', help='Comma-separated mock sites to crawl')
+    parser.add_argument('--cycles', type=int, default=3)
+    parser.add_argument('--pause', type=float, default=5, help='Seconds between cycles, so new listings arrive')
+    parser.add_argument('--max-pages', type=int, default=10)
+    parser.add_argument('--delay', type=float, default=0, help='scraping.delay_between_requests')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=3, help='performance.max_concurrent_requests')
+    parser.add_argument('--sharding', action='store_true', help='Enable price sharding')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--output', help='Write the report JSON to this file')
+    args = parser.parse_args()
+    args.sites = [name.strip() for name in args.sites.split(',')]
+    
+    site = site_from_args(args).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'load.db')
+        config_path = os.path.join(tmp, 'config.yaml')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(build_config(args, site, db_path), f, allow_unicode=True)
+        
+        try:
+            manager = HomeusManager(config_path)
+            reports = run_cycles(manager, site, db_path, args.cycles, args.pause)
+        finally:
+            site.stop()
+    
+    report = {
+        'settings': {key: value for key, value in vars(args).items() if key not in ('config', 'output')},
+        'summary': summarize(reports),
+        'cycles': reports,
+    }
+    print(json.dumps(report['summary'], indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
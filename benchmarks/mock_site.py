@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+import json
+import math
+import random
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+DISTRICTS = ['ვაკე', 'საბურთალო', 'ვერე', 'დიდუბე', 'გლდანი', 'ისანი', 'ნაძალადევი', 'მთაწმინდა']
+STREETS = ['ჭავჭავაძის გამზ.', 'პეკინის ქ.', 'ვაჟა-ფშაველას გამზ.', 'წერეთლის გამზ.', 'აღმაშენებლის ხეივანი', 'ბახტრიონის ქ.']
+DESCRIPTION = 'ბინა მდებარეობს ქალაქის ცენტრთან ახლოს, ახალი რემონტით, ავეჯით და ტექნიკით. ' * 6
+
+PAGE_HEAD = ('<!DOCTYPE html><html lang="ka"><head><meta charset="utf-8"><title>{title}</title>'
+             '<link rel="stylesheet" href="/static/app.css"></head><body>'
+             '<header class="header"><nav><ul class="nav">{nav}</ul></nav></header>')
+PAGE_FOOT = '<footer class="footer"><p class="footer-link"><a href="/ka/info">ინფორმაცია</a></p></footer></body></html>'
+NAV = ''.join(f'<li class="nav-item"><a href="/ka/category/{i}">კატეგორია {i}</a></li>' for i in range(40))
+
+SS_CARD = '''<div class="latest-item" data-id="{pid}">
+  <div class="latest-item-img"><img src="/images/{pid}/thumb_1.jpg" alt=""></div>
+  <div class="latest-item-info">
+    <h3><a href="/ka/udzravi-qoneba/iyideba-{rooms}-otaxiani-bina-{pid}">იყიდება {rooms} ოთახიანი ბინა {district}ში, {street}</a></h3>
+    <div class="location">{district}, {street} {number}</div>
+    <div class="details"><span>{rooms} ოთახი</span> <span>{size} მ²</span> <span>სართული {floor}/{total_floors}</span></div>
+    <div class="price">{price:,} $</div>
+  </div>
+</div>'''
+
+SS_DETAIL = '''<main class="detail"><h1>იყიდება {rooms} ოთახიანი ბინა {district}ში, {street}</h1>
+<div class="price">{price:,} $</div><div class="location">{district}, {street} {number}</div>
+<div class="gallery">{gallery}</div><div class="details"><span>{rooms} ოთახი</span><span>ფართი {size} მ²</span></div>
+<div class="description">{description}</div></main>'''
+
+MYHOME_CARD = '''<div class="statement-card" data-product-id="{pid}">
+  <div class="card-image"><img src="/photos/{pid}/thumbs/1.jpg"></div>
+  <div class="statement-info">
+    <h2 class="statement-title"><a href="/pr/{pid}/iyideba-bina">იყიდება {rooms} ოთახიანი ბინა {district}ში</a></h2>
+    <div class="statement-address">{street} {number}, {district}</div>
+    <div class="statement-details"><span>{rooms} ოთახი</span><span>ფართი {size} m²</span></div>
+    <div class="statement-price">{price:,} $</div>
+  </div>
+</div>'''
+
+MYHOME_DETAIL = '''<main class="detail"><h1 class="main-title">იყიდება {rooms} ოთახიანი ბინა {district}ში</h1>
+<div class="price">{price:,} $</div><div class="address">{district}, {street} {number}</div>
+<div class="property-gallery">{gallery}</div><div class="property-description">{description}</div></main>'''
+
+SITES = {
+    'ss': {
+        'first_id': 31000000,
+        'search_path': '/ka/udzravi-qoneba/iyideba-bina',
+        'search_query': '?price_type=1&currency_id=2&price_from=0&price_to={max_price}&page=1',
+        'detail_prefix': '/ka/udzravi-qoneba/',
+        'card': SS_CARD,
+        'detail': SS_DETAIL,
+        'gallery': '<img src="/images/{pid}/photo_{index}.jpg">',
+        'wrap': '<main class="container"><div class="latest-items">{cards}</div></main>',
+    },
+    'myhome': {
+        'first_id': 17000000,
+        'search_path': '/s/iyideba-bina-Tbilisshi/',
+        'search_query': '?deal_types=1&currency_id=2&price_from=0&price_to={max_price}&page=1',
+        'detail_prefix': '/pr/',
+        'card': MYHOME_CARD,
+        'detail': MYHOME_DETAIL,
+        'gallery': '<img src="/photos/{pid}/large/{index}.jpg">',
+        'wrap': '<main><div class="statements-list">{cards}</div></main>',
+    },
+}
+
+class Inventory:
+    def __init__(self, site: str, initial_listings: int, arrival_rate: float, max_price: int, seed: int):
+        self.site = site
+        self.spec = SITES[site]
+        self.initial_listings = initial_listings
+        self.arrival_rate = arrival_rate
+        self.max_price = max_price
+        self.seed = seed
+        self.started = time.time()
+        self.listings = []
+        self.by_id = {}
+        self._lock = threading.Lock()
+    
+    def _listing(self, index: int) -> dict:
+        rng = random.Random(f"{self.seed}:{self.site}:{index}")
+        rooms = rng.randint(1, 5)
+        return {
+            'pid': self.spec['first_id'] + index,
+            'rooms': rooms,
+            'size': rng.randint(25 + rooms * 10, 60 + rooms * 25),
+            'price': rng.randrange(20000, self.max_price, 500),
+            'district': rng.choice(DISTRICTS),
+            'street': rng.choice(STREETS),
+            'number': rng.randint(1, 120),
+            'floor': rng.randint(1, 16),
+            'total_floors': rng.randint(16, 25),
+        }
+    
+    def snapshot(self) -> list:
+        target = self.initial_listings + int((time.time() - self.started) * self.arrival_rate)
+        with self._lock:
+            while len(self.listings) < target:
+                listing = self._listing(len(self.listings))
+                self.listings.append(listing)
+                self.by_id[listing['pid']] = listing
+            # Newest first, like the real search results
+            return self.listings[::-1]
+    
+    def get(self, pid: int) -> dict:
+        self.snapshot()
+        with self._lock:
+            return self.by_id.get(pid)
+
+class MockSite:
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, initial_listings: int = 2000,
+                 arrival_rate: float = 0.5, page_size: int = 30, max_price: int = 250000,
+                 latency_ms: float = 50, latency_sigma: float = 0.5,
+                 rate_429: float = 0.0, rate_5xx: float = 0.0, seed: int = 13):
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.max_price = max_price
+        self.rng = random.Random(seed)
+        self.inventories = {site: Inventory(site, initial_listings, arrival_rate, max_price, seed) for site in SITES}
+        self.stats = {'requests': 0, 'listing_pages': 0, 'detail_pages': 0, 'status_429': 0, 'status_5xx': 0, 'not_found': 0}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def base_url(self, site: str) -> str:
+        return f"{self.url}/{site}"
+    
+    def search_url(self, site: str) -> str:
+        spec = SITES[site]
+        return self.base_url(site) + spec['search_path'] + spec['search_query'].format(max_price=self.max_price)
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='mock-site', daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def snapshot_stats(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+    
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+    
+    def _latency(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            # Log-normal around the median, so a few requests are much slower than the rest
+            return self.latency_ms / 1000 * math.exp(self.rng.gauss(0, self.latency_sigma))
+    
+    def _injected_error(self):
+        with self._lock:
+            roll = self.rng.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.rate_5xx:
+            return 503
+        return None
+    
+    def render_listing_page(self, site: str, query: dict) -> str:
+        spec = SITES[site]
+        try:
+            page = max(1, int(query.get('page', 1)))
+            low = int(float(query.get('price_from') or 0))
+            high = int(float(query.get('price_to') or self.max_price))
+        except ValueError:
+            page, low, high = 1, 0, self.max_price
+        
+        listings = [item for item in self.inventories[site].snapshot() if low <= item['price'] <= high]
+        start = (page - 1) * self.page_size
+        cards = '\n'.join(spec['card'].format(**item) for item in listings[start:start + self.page_size])
+        return PAGE_HEAD.format(title='იყიდება ბინა', nav=NAV) + spec['wrap'].format(cards=cards) + PAGE_FOOT
+    
+    def render_detail_page(self, site: str, path: str):
+        spec = SITES[site]
+        digits = ''.join(ch if ch.isdigit() else ' ' for ch in path[len(spec['detail_prefix']):]).split()
+        listing = None
+        for token in digits:
+            if len(token) >= 7:
+                listing = self.inventories[site].get(int(token))
+                break
+        if listing is None:
+            return None
+        
+        gallery = ''.join(spec['gallery'].format(pid=listing['pid'], index=index) for index in range(8))
+        main = spec['detail'].format(gallery=gallery, description=DESCRIPTION, **listing)
+        return PAGE_HEAD.format(title='იყიდება ბინა', nav=NAV) + main + PAGE_FOOT
+    
+    def _handler(self):
+        site = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == '/_stats':
+                    self._send(200, json.dumps(site.snapshot_stats()), 'application/json')
+                    return
+                
+                site._count('requests')
+                time.sleep(site._latency())
+                
+                status = site._injected_error()
+                if status == 429:
+                    site._count('status_429')
+                    self._send(429, 'Too Many Requests', headers={'Retry-After': '1'})
+                    return
+                if status:
+                    site._count('status_5xx')
+                    self._send(status, 'Service Unavailable')
+                    return
+                
+                site_name, _, path = parts.path.lstrip('/').partition('/')
+                path = '/' + path
+                spec = SITES.get(site_name)
+                body = None
+                if spec and path == spec['search_path']:
+                    site._count('listing_pages')
+                    body = site.render_listing_page(site_name, dict(parse_qsl(parts.query)))
+                elif spec and path.startswith(spec['detail_prefix']):
+                    body = site.render_detail_page(site_name, path)
+                    if body is not None:
+                        site._count('detail_pages')
+                
+                if body is None:
+                    site._count('not_found')
+                    self._send(404, 'Not Found')
+                    return
+                self._send(200, body)
+            
+            def _send(self, status: int, body: str, content_type: str = 'text/html; charset=utf-8', headers: dict = None):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+def add_site_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--listings', type=int, default=2000, help='Listings per site when the server starts')
+    parser.add_argument('--arrival-rate', type=float, default=0.5, help='New listings per second per site')
+    parser.add_argument('--page-size', type=int, default=30)
+    parser.add_argument('--latency-ms', type=float, default=50, help='Median response latency')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Log-normal spread of the latency')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--seed', type=int, default=13)
+
+def site_from_args(args) -> MockSite:
+    return MockSite(
+        host=args.host, port=args.port, initial_listings=args.listings, arrival_rate=args.arrival_rate,
+        page_size=args.page_size, latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx, seed=args.seed
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic SS.ge / MyHome.ge pages for load testing')
+    add_site_arguments(parser)
+    args = parser.parse_args()
+    
+    site = site_from_args(args)
+    for name in SITES:
+        print(f"{name}: base_url {site.base_url(name)}")
+        print(f"{name}: search    {site.search_url(name)}")
+    print(f"stats: {site.url}/_stats")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.stop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import time
+import random
+import sqlite3
+import platform
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import datetime
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from bs4 import BeautifulSoup
+
+from scraper.ss_scraper import SSScraper
+from scraper.myhome_scraper import MyHomeScraper
+from storage.database import Database, INSERT_PROPERTY, ROW_COLUMNS
+from models.property import Property
+import bench_listing_card
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+SITES = {
+    'ss': {
+        'scraper': SSScraper,
+        'base_url': 'https://home.ss.ge',
+        'card_selector': '.latest-item',
+        'search_url': 'https://home.ss.ge/ka/udzravi-qoneba/iyideba-bina?page=1',
+        'detail_url': 'https://home.ss.ge/ka/udzravi-qoneba/iyideba-3-otaxiani-bina-vakeshi-31234567',
+    },
+    'myhome': {
+        'scraper': MyHomeScraper,
+        'base_url': 'https://www.myhome.ge',
+        'card_selector': '.statement-card',
+        'search_url': 'https://www.myhome.ge/s/iyideba-bina-Tbilisshi/?page=1',
+        'detail_url': 'https://www.myhome.ge/pr/17234567/iyideba-bina-saburtaloze',
+    },
+}
+
+class FixtureResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.status_code = 200
+        self.ok = True
+    
+    def raise_for_status(self):
+        pass
+
+class FixtureSession:
+    def __init__(self, content: bytes):
+        self.response = FixtureResponse(content)
+    
+    def get(self, url, **kwargs):
+        return self.response
+
+def throughput(func, min_time: float) -> dict:
+    items = 0
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        items += func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+    return {
+        'items_per_sec': round(items / elapsed, 1),
+        'us_per_item': round(elapsed / items * 1e6, 2),
+        'calls': calls
+    }
+
+def bench_parsing(min_time: float) -> dict:
+    results = {}
+    for site, spec in SITES.items():
+        scraper = spec['scraper']({'base_url': spec['base_url']})
+        listing_html = (FIXTURES / f"{site}_listing.html").read_bytes()
+        detail_html = (FIXTURES / f"{site}_detail.html").read_bytes()
+        
+        def parse_listing_page():
+            soup = BeautifulSoup(listing_html, 'html.parser')
+            return len(scraper._parse_listing_page(soup, spec['search_url']))
+        
+        card_elements = BeautifulSoup(listing_html, 'html.parser').select(spec['card_selector'])
+        
+        def parse_property_card():
+            for card in card_elements:
+                scraper._parse_property_card(card, spec['search_url'])
+            return len(card_elements)
+        
+        scraper.session = FixtureSession(detail_html)
+        
+        def scrape_property_details():
+            return 1 if scraper.scrape_property_details(spec['detail_url']) else 0
+        
+        results[site] = {
+            'parse_listing_page_cards': throughput(parse_listing_page, min_time),
+            'parse_property_card': throughput(parse_property_card, min_time),
+            'scrape_property_details': throughput(scrape_property_details, min_time),
+        }
+    return results
+
+HASH_INDEX = ROW_COLUMNS.index('hash')
+
+def _template_row(db: Database) -> tuple:
+    prop = Property(
+        property_id="bench_0",
+        title="იყიდება 2 ოთახიანი ბინა",
+        price=50000,
+        location="Tbilisi",
+        size=60,
+        rooms=2,
+        property_type="apartment",
+        source_url="https://example.com/search",
+        detail_url="https://example.com/pr/0"
+    )
+    return db._property_row(prop)
+
+def _populate(db: Database, rows: int, chunk_size: int = 10000):
+    template = list(_template_row(db))
+    with sqlite3.connect(db.db_path) as conn:
+        for start in range(0, rows, chunk_size):
+            batch = []
+            for index in range(start, min(start + chunk_size, rows)):
+                row = list(template)
+                row[0] = f"bench_{index}"
+                row[1] = f"იყიდება {index % 5 + 1} ოთახიანი ბინა #{index}"
+                row[HASH_INDEX] = f"{index:032x}"
+                batch.append(tuple(row))
+            conn.executemany(INSERT_PROPERTY, batch)
+            conn.commit()
+
+def bench_database(sizes: list, sample: int) -> dict:
+    results = {}
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            
+            started = time.perf_counter()
+            _populate(db, rows)
+            populate_seconds = time.perf_counter() - started
+            
+            rng = random.Random(rows)
+            new_props = [
+                Property(
+                    property_id=f"new_{index}", title="Benchmark listing", price=50000, location="Tbilisi",
+                    size=60, rooms=2, property_type="apartment", source_url="https://example.com/search"
+                )
+                for index in range(sample)
+            ]
+            existing_ids = [f"bench_{rng.randrange(rows)}" for _ in range(sample)]
+            missing_ids = [f"missing_{index}" for index in range(sample)]
+            
+            def timed_ops(func, items) -> dict:
+                started = time.perf_counter()
+                for item in items:
+                    func(item)
+                elapsed = time.perf_counter() - started
+                return {'ops_per_sec': round(len(items) / elapsed, 1), 'us_per_op': round(elapsed / len(items) * 1e6, 2)}
+            
+            results[str(rows)] = {
+                'bulk_load_rows_per_sec': round(rows / populate_seconds, 1),
+                'insert': timed_ops(db.save_property, new_props),
+                'lookup_hit': timed_ops(db.is_new_property, existing_ids),
+                'lookup_miss': timed_ops(db.is_new_property, missing_ids),
+                'update_last_seen': timed_ops(db.update_property_last_seen, existing_ids),
+            }
+    return results
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def _flatten(data, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, (int, float)) and not name.endswith('.calls'):
+            flat[name] = value
+    return flat
+
+def compare(baseline: dict, current: dict):
+    old = _flatten(baseline['results'])
+    new = _flatten(current['results'])
+    print(f"Comparing {baseline.get('commit')} -> {current.get('commit')}")
+    for name in sorted(old.keys() & new.keys()):
+        if not old[name]:
+            continue
+        change = (new[name] - old[name]) / old[name] * 100
+        print(f"  {name}: {old[name]} -> {new[name]} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline scraper and storage benchmarks')
+    parser.add_argument('--rows', default='10000,100000', help='Comma-separated database sizes (e.g. 10000,100000,1000000)')
+    parser.add_argument('--sample', type=int, default=2000, help='Operations timed per database benchmark')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds spent on each parsing benchmark')
+    parser.add_argument('--only', choices=['parsing', 'database', 'listing_card'], help='Run a single group')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against')
+    args = parser.parse_args()
+    
+    results = {}
+    if args.only in (None, 'parsing'):
+        results['parsing'] = bench_parsing(args.min_time)
+    if args.only in (None, 'database'):
+        results['database'] = bench_database([int(size) for size in args.rows.split(',')], args.sample)
+    if args.only in (None, 'listing_card'):
+        results['listing_card'] = {key: round(value, 3) for key, value in bench_listing_card.run(20000).items()}
+    
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+    
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding='utf-8')), report)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import argparse
+import csv
+import json
+import sqlite3
+import time
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.storage.database import Database, PROPERTY_FIELDS
+from src.utils.config import load_config
+
+CSV_COLUMNS = ['seq', 'event_type', 'property_id', 'created_at'] + [
+    field for field in PROPERTY_FIELDS if field not in ('id', 'property_id')
+] + ['old_price']
+
+def log(message: str):
+    # Data may be going to stdout, so progress goes to stderr
+    print(message, file=sys.stderr)
+
+def read_cursor(path: Path) -> int:
+    try:
+        return int(path.read_text().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+def write_cursor(path: Path, seq: int):
+    # Written only after the chunk is flushed, so a crash re-exports at most one chunk
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(f"{seq}\n")
+    os.replace(tmp, path)
+
+def to_record(change: dict) -> dict:
+    return {
+        'seq': change['seq'],
+        'event_type': change['event_type'],
+        'property_id': change['property_id'],
+        'created_at': change['created_at'],
+        'data': json.loads(change['payload'])
+    }
+
+class JsonlWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, changes: list):
+        for change in changes:
+            self.out.write(json.dumps(to_record(change), ensure_ascii=False) + '\n')
+
+class CsvWriter:
+    def __init__(self, out, header: bool):
+        self.writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        if header:
+            self.writer.writeheader()
+
+    def write(self, changes: list):
+        for change in changes:
+            record = to_record(change)
+            data = record.pop('data')
+            record.update({
+                key: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                for key, value in data.items() if key != 'property_id'
+            })
+            self.writer.writerow(record)
+
+def export_changes(db: Database, output: str, fmt: str, cursor_file: str = None, since: int = None,
+                   chunk_size: int = 1000, limit: int = None, follow: bool = False, poll_seconds: float = 5) -> int:
+    cursor_path = Path(cursor_file) if cursor_file else None
+    start = since if since is not None else (read_cursor(cursor_path) if cursor_path else 0)
+
+    if output == '-':
+        out = sys.stdout
+        header = start == 0
+    else:
+        # Resumed exports append to what the previous run already wrote
+        header = start == 0 or not os.path.exists(output) or os.path.getsize(output) == 0
+        out = open(output, 'w' if start == 0 else 'a', encoding='utf-8', newline='')
+    writer = CsvWriter(out, header) if fmt == 'csv' else JsonlWriter(out)
+
+    log(f"📤 Exporting changes after seq {start} (head is {db.get_change_head()})")
+    exported = 0
+    last_seq = start
+    try:
+        while True:
+            remaining = None if limit is None else limit - exported
+            for changes in db.iter_changes(last_seq, chunk_size, remaining):
+                writer.write(changes)
+                out.flush()
+                last_seq = changes[-1]['seq']
+                exported += len(changes)
+                if cursor_path:
+                    write_cursor(cursor_path, last_seq)
+
+            if not follow or (limit is not None and exported >= limit):
+                break
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    log(f"✅ Exported {exported} changes, last seq {last_seq}")
+    return last_seq
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Stream the Homeus change log as JSONL or CSV')
+    parser.add_argument('--config', default='config/config.yaml', help='Configuration file path')
+    parser.add_argument('--db', help='Database path (default: database.path from the config)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help='Output format')
+    parser.add_argument('--output', default='-', help='Output file, or - for stdout')
+    parser.add_argument('--cursor-file', help='File holding the last exported seq; read on start and updated after every chunk')
+    parser.add_argument('--since', type=int, help='Export changes after this seq, overriding the cursor file')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Changes read and written per chunk')
+    parser.add_argument('--limit', type=int, help='Stop after this many changes')
+    parser.add_argument('--follow', action='store_true', help='Keep polling for new changes')
+    parser.add_argument('--poll-seconds', type=float, default=5, help='Polling interval with --follow')
+    args = parser.parse_args()
+
+    db_path = args.db or load_config(args.config)['database']['path']
+    try:
+        # The exporter only reads; the scraper owns the schema
+        db = Database.open_readonly(db_path)
+        export_changes(db, args.output, args.format, args.cursor_file, args.since,
+                       args.chunk_size, args.limit, args.follow, args.poll_seconds)
+    except (FileNotFoundError, sqlite3.Error) as e:
+        log(f"❌ {e}")
+        sys.exit(1)
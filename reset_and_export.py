@@ -2,78 +2,68 @@
 
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.storage.database import Database
 from src.storage.sheets_manager import SheetsManager
+from src.storage.sheet_reconciler import SheetReconciler
 from src.models.property import Property
 from src.utils.config import load_config
-import json
-from datetime import datetime
 
-def reset_and_export():
-    print("🔄 Resetting Google Sheet and re-exporting data...")
-    
+def reset_and_export(reset: bool = False, dry_run: bool = False, chunk_size: int = 1000):
+    print("🔄 Syncing Google Sheet with the database...")
+
     config = load_config('config/config.yaml')
-    
+
     if not config['google_sheets']['enabled']:
         print("❌ Google Sheets is not enabled in config")
         return
-    
-    db = Database('data/homeus.db')
+
+    db = Database(config['database']['path'])
     sheets = SheetsManager(config['google_sheets'])
-    
+
     if not sheets.worksheet:
         print("❌ Could not connect to Google Sheets")
         return
-    
+
     print("✅ Connected to Google Sheets")
-    
-    sheets._setup_headers()
-    print("✅ Headers set up")
-    
-    recent_properties = db.get_recent_properties(50)
-    print(f"📊 Found {len(recent_properties)} properties to export")
-    
-    properties_to_export = []
-    for prop_data in recent_properties:
-        try:
-            images_list = json.loads(prop_data['images']) if prop_data['images'] else []
-            
-            prop = Property(
-                property_id=prop_data['property_id'],
-                title=prop_data['title'],
-                price=prop_data['price'],
-                currency=prop_data['currency'],
-                location=prop_data['location'],
-                district=prop_data['district'],
-                size=prop_data['size'],
-                rooms=prop_data['rooms'],
-                bedrooms=prop_data['bedrooms'],
-                floor=prop_data['floor'],
-                total_floors=prop_data['total_floors'],
-                property_type=prop_data['property_type'],
-                description=prop_data['description'],
-                images=images_list,
-                source_url=prop_data['source_url'],
-                detail_url=prop_data['detail_url'],
-                listing_date=datetime.fromisoformat(prop_data['listing_date']) if prop_data['listing_date'] else None,
-                scraped_at=datetime.fromisoformat(prop_data['scraped_at'])
-            )
-            properties_to_export.append(prop)
-        except Exception as e:
-            print(f"⚠️ Error processing property {prop_data['property_id']}: {e}")
-            continue
-    
-    if properties_to_export:
-        success = sheets.add_properties_batch(properties_to_export)
-        if success:
-            print(f"✅ Successfully exported {len(properties_to_export)} properties to Google Sheets")
-            print(f"🔗 View your sheet: {sheets.get_sheet_url()}")
-        else:
-            print("❌ Failed to export properties to Google Sheets")
-    else:
-        print("⚠️ No properties to export")
+
+    if reset:
+        full_export(db, sheets, chunk_size)
+        return
+
+    stats = SheetReconciler(db, sheets, chunk_size=chunk_size).run(dry_run=dry_run)
+    prefix = "🔍 Would push" if dry_run else "✅ Pushed"
+    print(f"{prefix} {stats['inserted']} inserts, {stats['updated']} updates, {stats['status_changed']} status changes, {stats['score_changed']} score changes")
+    print(f"📊 {stats['unchanged']} rows already up to date, {stats['sheet_only']} rows only in the sheet, {stats['errors']} errors")
+    print(f"🔗 View your sheet: {sheets.get_sheet_url()}")
+
+def full_export(db: Database, sheets: SheetsManager, chunk_size: int):
+    sheets.setup_headers()
+    print("✅ Sheet cleared and headers set up")
+
+    exported = 0
+    for chunk in db.iter_properties(chunk_size):
+        for prop_data in chunk:
+            try:
+                sheets.queue_property(Property.from_db_row(prop_data))
+            except Exception as e:
+                print(f"⚠️ Error processing property {prop_data['property_id']}: {e}")
+
+        if not sheets.flush():
+            print(f"❌ Failed to export properties to Google Sheets after {exported} rows")
+            return
+        exported += len(chunk)
+
+    print(f"✅ Successfully exported {exported} properties to Google Sheets")
+    print(f"🔗 View your sheet: {sheets.get_sheet_url()}")
 
 if __name__ == "__main__":
-    reset_and_export() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Sync the Google Sheet with the Homeus database')
+    parser.add_argument('--reset', action='store_true', help='Clear the sheet and re-export every property')
+    parser.add_argument('--dry-run', action='store_true', help='Report the reconciliation diff without writing')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Database rows read per chunk')
+    args = parser.parse_args()
+
+    reset_and_export(reset=args.reset, dry_run=args.dry_run, chunk_size=args.chunk_size)
@@ -0,0 +1,3 @@
+from .server import ApiServer, ReadApi
+
+__all__ = ['ApiServer', 'ReadApi']
\ No newline at end of file
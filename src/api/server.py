@@ -0,0 +1,156 @@
+import base64
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple, Union
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.database import Database
+
+DEFAULT_FIELDS = (
+    'property_id', 'title', 'price', 'currency', 'location', 'size', 'rooms',
+    'detail_url', 'scraped_at', 'is_active', 'canonical_id', 'deal_score'
+)
+
+def encode_cursor(position: Union[str, float], row_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([position, row_id]).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[Union[str, float], int]:
+    try:
+        position, row_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        # The position keeps its JSON type: SQLite orders every number before any text
+        if not isinstance(position, (str, int, float)):
+            raise ValueError("Invalid cursor")
+        return position, int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+class ReadApi:
+    def __init__(self, db: Database, config: dict):
+        self.db = db
+        self.cache_ttl = config.get('cache_ttl_seconds', 5)
+        self.default_limit = config.get('default_limit', 50)
+        self.max_limit = config.get('max_limit', 500)
+        self.max_cached = config.get('max_cached_responses', 256)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def handle(self, path: str, params: dict) -> Tuple[int, dict]:
+        if path == '/properties':
+            return 200, self.list_properties(params)
+        if path.startswith('/properties/'):
+            prop = self.db.get_property(unquote(path[len('/properties/'):]))
+            if prop is None:
+                return 404, {'error': 'not found'}
+            prop['images'] = json.loads(prop['images']) if prop.get('images') else []
+            return 200, prop
+        if path == '/stats':
+            return 200, self.db.get_stats()
+        if path == '/stats/daily':
+            return 200, {'items': self.db.get_daily_counts(min(max(1, int(params.get('days', 7))), 366))}
+        if path == '/market':
+            return 200, {'items': self.db.get_market_stats(params.get('currency'), params.get('district'))}
+        return 404, {'error': 'not found'}
+    
+    def list_properties(self, params: dict) -> dict:
+        fields = [field for field in params.get('fields', '').split(',') if field] or list(DEFAULT_FIELDS)
+        limit = min(max(1, int(params.get('limit', self.default_limit))), self.max_limit)
+        filters = {
+            'site': params.get('site'),
+            'currency': params.get('currency'),
+            'min_price': int(params['min_price']) if params.get('min_price') else None,
+            'max_price': int(params['max_price']) if params.get('max_price') else None,
+            'rooms': int(params['rooms']) if params.get('rooms') else None,
+            'active': params['active'] in ('1', 'true') if params.get('active') else None,
+            'since': params.get('since'),
+            'canonical_id': params.get('canonical_id'),
+        }
+        order = params.get('order', 'scraped_at')
+        after = decode_cursor(params['cursor']) if params.get('cursor') else None
+        
+        rows = self.db.query_properties(fields, filters, limit + 1, after, order)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][order], rows[-1]['id'])
+        
+        # Keyset columns are always read for the cursor but only returned when asked for
+        for row in rows:
+            for key in (order, 'id'):
+                if key not in fields:
+                    row.pop(key)
+            if 'images' in row:
+                row['images'] = json.loads(row['images']) if row['images'] else []
+        return {'items': rows, 'next_cursor': next_cursor}
+    
+    def respond(self, url: str) -> Tuple[int, str, bytes]:
+        key = url
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self._cache.move_to_end(key)
+                return cached[1:]
+        
+        parts = urlsplit(url)
+        try:
+            status, payload = self.handle(parts.path.rstrip('/') or '/', dict(parse_qsl(parts.query)))
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except sqlite3.Error as e:
+            # A locked or busy database is temporary; answer instead of dropping the connection
+            logging.warning(f"Read API query failed for {parts.path}: {e}")
+            status, payload = 503, {'error': 'database unavailable'}
+        
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        if status == 200 and self.cache_ttl:
+            with self._lock:
+                self._cache[key] = (now + self.cache_ttl, status, etag, body)
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+        return status, etag, body
+
+class ApiServer(threading.Thread):
+    def __init__(self, db: Database, config: dict):
+        super().__init__(name='homeus-api', daemon=True)
+        api = ReadApi(db, config)
+        cache_ttl = api.cache_ttl
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, etag, body = api.respond(self.path)
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', f"max-age={cache_ttl}")
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.api = api
+        self.server = ThreadingHTTPServer((config.get('host', '127.0.0.1'), config.get('port', 8088)), Handler)
+    
+    def run(self):
+        logging.info(f"Serving read API on http://{self.server.server_address[0]}:{self.server.server_address[1]}")
+        self.server.serve_forever()
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
\ No newline at end of file
@@ -0,0 +1,4 @@
+from .minhash import MinHasher, shingles
+from .detector import DuplicateDetector
+
+__all__ = ['MinHasher', 'shingles', 'DuplicateDetector']
\ No newline at end of file
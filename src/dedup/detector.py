@@ -0,0 +1,111 @@
+import logging
+from array import array
+from typing import List, Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.property import Property
+from dedup.minhash import MinHasher, shingles
+
+class DuplicateDetector:
+    def __init__(self, db, config: dict):
+        self.db = db
+        self.hasher = MinHasher(config.get('num_perm', 64), config.get('bands', 16))
+        self.threshold = config.get('similarity_threshold', 0.6)
+        self.price_tolerance = config.get('price_tolerance', 0.05)
+        self.size_tolerance = config.get('size_tolerance', 0.05)
+        self.max_candidates = config.get('max_candidates', 50)
+        self.numeric_threshold = config.get('numeric_similarity_threshold', 0.3)
+        self.duplicates_found = 0
+        self.backfill_done = False
+        self._backfill_after = 0
+    
+    def _text(self, prop) -> str:
+        return f"{prop.title} {prop.description or ''}"
+    
+    def _blocking_keys(self, prop, signature: array) -> List[str]:
+        keys = self.hasher.band_keys(signature)
+        # Reposts on the other site often share little wording, so identical rooms and size also make a candidate
+        if prop.rooms and prop.size:
+            keys.append(f"n:{prop.rooms}:{round(prop.size)}")
+        return keys
+    
+    def _close(self, first: Optional[float], second: Optional[float], tolerance: float) -> bool:
+        if first is None or second is None:
+            return True
+        return abs(first - second) <= tolerance * max(first, second)
+    
+    def _numbers_match(self, prop, candidate: dict) -> bool:
+        if prop.rooms and candidate['rooms'] and prop.rooms != candidate['rooms']:
+            return False
+        if not self._close(prop.size, candidate['size'], self.size_tolerance):
+            return False
+        if prop.currency == candidate['currency'] and not self._close(prop.price, candidate['price'], self.price_tolerance):
+            return False
+        return True
+    
+    def _exact_numbers(self, prop, candidate: dict) -> bool:
+        return bool(
+            prop.rooms and prop.size and prop.price
+            and prop.rooms == candidate['rooms']
+            and prop.currency == candidate['currency']
+            and self._close(prop.size, candidate['size'], 0.01)
+            and self._close(prop.price, candidate['price'], 0.01)
+        )
+    
+    def _corroborated(self, prop, candidate: dict, score: float, photo_matches: set) -> bool:
+        # Identical numbers are common within one new-build block, so they only count with some shared wording or photos
+        if not self._exact_numbers(prop, candidate):
+            return False
+        return (score >= self.numeric_threshold
+                or candidate['property_id'] in photo_matches or candidate['canonical_id'] in photo_matches)
+    
+    def assign(self, prop: Property, image_matches: Optional[List[str]] = None) -> str:
+        try:
+            signature = self.hasher.signature(shingles(self._text(prop)))
+            keys = self._blocking_keys(prop, signature)
+            photo_matches = set(image_matches or [])
+            
+            best = None
+            best_score = 0.0
+            for candidate in self.db.get_duplicate_candidates(keys, prop.property_id, self.max_candidates):
+                if not self._numbers_match(prop, candidate):
+                    continue
+                
+                score = MinHasher.similarity(signature, array('I', candidate['signature']))
+                if score < self.threshold and not self._corroborated(prop, candidate, score, photo_matches):
+                    continue
+                if best is None or score > best_score:
+                    best, best_score = candidate, score
+            
+            prop.canonical_id = best['canonical_id'] if best else prop.property_id
+            if best:
+                self.duplicates_found += 1
+                logging.info(f"{prop.property_id} looks like a repost of {prop.canonical_id} (similarity {best_score:.2f})")
+            elif image_matches:
+                prop.canonical_id = self.db.get_canonical_id(image_matches[0]) or image_matches[0]
+                self.duplicates_found += 1
+                logging.info(f"{prop.property_id} shares photos with {prop.canonical_id}")
+            
+            self.db.save_listing_signature(prop, signature.tobytes(), keys)
+        except Exception as e:
+            logging.error(f"Error checking {prop.property_id} for duplicates: {e}")
+            prop.canonical_id = prop.canonical_id or prop.property_id
+        
+        return prop.canonical_id
+    
+    def backfill(self, chunk_size: int = 500, limit: Optional[int] = None) -> int:
+        # Resumes after the last row it saw, so a row that keeps failing cannot stall later batches
+        indexed = 0
+        for chunk in self.db.iter_unsigned_properties(min(chunk_size, limit or chunk_size), self._backfill_after):
+            for row in chunk:
+                prop = Property.from_db_row(row)
+                self.assign(prop)
+                self.db.set_canonical_id(prop.property_id, prop.canonical_id)
+                self._backfill_after = row['id']
+                indexed += 1
+            if limit is not None and indexed >= limit:
+                return indexed
+        self.backfill_done = True
+        return indexed
\ No newline at end of file
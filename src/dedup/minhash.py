@@ -0,0 +1,55 @@
+import hashlib
+import random
+import zlib
+from array import array
+from typing import Iterable, List, Set
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.helpers import normalize_text
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+def shingles(text: str, size: int = 4) -> Set[str]:
+    text = normalize_text(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 13):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        generator = random.Random(seed)
+        self._params = [
+            (generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+    
+    def signature(self, tokens: Iterable[str]) -> array:
+        hashes = [zlib.crc32(token.encode('utf-8')) for token in tokens]
+        if not hashes:
+            return array('I', [MAX_HASH] * self.num_perm)
+        return array('I', [
+            min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in hashes)
+            for a, b in self._params
+        ])
+    
+    def band_keys(self, signature: array) -> List[str]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append(f"b{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+        return keys
+    
+    @staticmethod
+    def similarity(first: array, second: array) -> float:
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
\ No newline at end of file
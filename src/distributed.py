@@ -0,0 +1,237 @@
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, List
+
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from models.listing_card import ListingCard
+from storage.work_queue import WorkQueue
+from utils.logger import log_context
+from utils.metrics import QUEUE_DEPTH, REGISTRY, stage_delta, stage_totals
+
+def build_work_queue(config: dict) -> WorkQueue:
+    queue_config = config.get('work_queue', {})
+    return WorkQueue(
+        config['database']['path'],
+        visibility_timeout=queue_config.get('visibility_timeout_seconds', 300),
+        max_attempts=queue_config.get('max_attempts', 3)
+    )
+
+class QueueCoordinator:
+    def __init__(self, manager, queue: WorkQueue):
+        self.manager = manager
+        self.queue = queue
+        self.poll_interval = manager.config.get('work_queue', {}).get('poll_interval_seconds', 5)
+        self.open_cycles: Dict[int, List] = {}
+    
+    def run(self):
+        manager = self.manager
+        manager.logger.info("Starting Homeus work-queue coordinator...")
+        manager.monitoring = True
+        
+        for cycle_id in self.queue.open_cycle_ids():
+            self.open_cycles[cycle_id] = []
+            manager.logger.info(f"Adopted unfinished queued cycle {cycle_id}")
+        for session_id in manager.db.get_orphaned_sessions():
+            if session_id not in self.open_cycles:
+                manager.db.abort_scraping_session(session_id, "Interrupted before any work was queued")
+        
+        if manager.outbox_worker:
+            manager.outbox_worker.start()
+        REGISTRY.add_collector(self._collect_queue_depth)
+        manager.start_metrics()
+        manager.scheduler.sync(manager._all_searches())
+        
+        while True:
+            manager.check_config_reload()
+            
+            due = manager.scheduler.due()
+            if due:
+                self.start_cycle(due)
+            self.finish_completed_cycles()
+            if not due and manager.backfill_duplicates_step():
+                continue
+            
+            time.sleep(min(self.poll_interval, max(1, manager.scheduler.seconds_until_next())))
+    
+    def _collect_queue_depth(self):
+        for kind, depth in self.queue.depth().items():
+            QUEUE_DEPTH.set(depth, queue=f"work_{kind}")
+    
+    def start_cycle(self, entries: List):
+        session_id = self.manager.db.start_scraping_session()
+        max_pages = self.manager.config['scraping'].get('max_pages', 5)
+        
+        for entry in entries:
+            scraper = self.manager.scrapers.get(entry.site_name)
+            if scraper is None:
+                continue
+            
+            for shard, url in enumerate(self.manager.sharder.shard_urls(scraper, entry.search_config['url'], max_pages)):
+                self.queue.enqueue(session_id, 'search_page', {
+                    'site_name': entry.site_name,
+                    'search_key': entry.key,
+                    'shard': shard,
+                    'url': url,
+                    'page': 1,
+                    'max_pages': max_pages
+                }, f"page:{session_id}:{entry.key}:{shard}:1")
+        
+        self.open_cycles[session_id] = entries
+        self.manager.logger.info(f"Queued cycle {session_id} for {len(entries)} searches")
+    
+    def finish_completed_cycles(self):
+        for cycle_id, entries in list(self.open_cycles.items()):
+            counts = self.queue.cycle_counts(cycle_id)
+            if counts.get('pending') or counts.get('leased'):
+                continue
+            
+            results = self.queue.cycle_results(cycle_id)
+            found = sum(totals.get('found', 0) for totals in results.values())
+            new = sum(totals.get('new', 0) for totals in results.values())
+            failed = counts.get('failed', 0)
+            
+            timings = {}
+            for totals in results.values():
+                for key, value in totals.items():
+                    if key.startswith('seconds_'):
+                        stage = key[len('seconds_'):]
+                        timings[stage] = round(timings.get(stage, 0) + value, 3)
+            
+            self.manager.score_new_listings()
+            self.manager._mark_delisted()
+            self.manager.db.finish_scraping_session(cycle_id, found, new, f"{failed} queued tasks failed" if failed else None,
+                                                    stage_timings=timings)
+            self.manager.logger.info(f"Cycle {cycle_id} completed. Found {found} properties, {new} new")
+            
+            for entry in entries:
+                self.manager.db.record_seen_listings(entry.key, results.get(entry.key, {}).get('found', 0))
+                self.manager.scheduler.record_result(entry.key, results.get(entry.key, {}).get('new', 0))
+            del self.open_cycles[cycle_id]
+            self.queue.purge_finished()
+
+class QueueWorker:
+    def __init__(self, manager, queue: WorkQueue, worker_id: str = None):
+        self.manager = manager
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = manager.config.get('work_queue', {}).get('poll_interval_seconds', 5)
+        self._current_task = None
+        self._cycle_id = None
+        self._stop_event = threading.Event()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='homeus-heartbeat', daemon=True)
+    
+    def run(self):
+        manager = self.manager
+        manager.logger.info(f"Starting Homeus worker {self.worker_id}...")
+        manager.monitoring = True
+        if manager.notifier:
+            manager.notifier.start()
+        if manager.images:
+            manager.images.start()
+        manager.start_metrics()
+        self._heartbeat.start()
+        
+        idle = True
+        while not self._stop_event.is_set():
+            tasks = self.queue.claim(self.worker_id)
+            if not tasks:
+                if not idle:
+                    manager._flush_sheets()
+                    manager._report_filters()
+                    idle = True
+                manager.check_config_reload()
+                time.sleep(self.poll_interval)
+                continue
+            
+            idle = False
+            self.run_task(tasks[0])
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def _heartbeat_loop(self):
+        interval = max(1, self.queue.visibility_timeout / 3)
+        while not self._stop_event.wait(interval):
+            task = self._current_task
+            if task and not self.queue.heartbeat(task['id'], self.worker_id):
+                logging.warning(f"Lost lease on task {task['id']}")
+    
+    def _enter_cycle(self, cycle_id: int):
+        if cycle_id == self._cycle_id:
+            return
+        if self._cycle_id is not None:
+            self.manager._report_coalescing()
+        
+        self._cycle_id = cycle_id
+        self.manager.cycle_seen = set()
+        self.manager.duplicates_skipped = 0
+        for scraper in self.manager.scrapers.values():
+            scraper.session.begin_cycle()
+    
+    def run_task(self, task: dict):
+        self._enter_cycle(task['cycle_id'])
+        with log_context(cycle=task['cycle_id'], task=task['id'], site=task['payload'].get('site_name')):
+            self._current_task = task
+            timings_before = stage_totals()
+            try:
+                if task['kind'] == 'search_page':
+                    result = self._handle_page(task)
+                elif task['kind'] == 'detail':
+                    result = self._handle_detail(task)
+                else:
+                    raise ValueError(f"Unknown task kind: {task['kind']}")
+                result.update({f"seconds_{stage}": seconds for stage, seconds in stage_delta(timings_before).items()})
+                
+                if not self.queue.complete(task['id'], self.worker_id, result):
+                    logging.warning(f"Task {task['id']} finished after its lease was taken over")
+            except Exception as e:
+                logging.error(f"Task {task['id']} ({task['kind']}) failed: {e}")
+                self.queue.fail(task['id'], self.worker_id, str(e), retry_delay=30 * task['attempts'])
+            finally:
+                self._current_task = None
+    
+    def _scraper(self, payload: dict):
+        scraper = self.manager.scrapers.get(payload['site_name'])
+        if scraper is None:
+            raise ValueError(f"No scraper configured for {payload['site_name']}")
+        return scraper
+    
+    def _handle_page(self, task: dict) -> dict:
+        payload = task['payload']
+        scraper = self._scraper(payload)
+        db = self.manager.db
+        
+        # Fetch and parse errors fail the task so the lease retries it; None only means the results ran out
+        cards = scraper.scrape_page(payload['url'], payload['page'], raise_errors=True)
+        if cards is None:
+            return {'pages': 1, 'found': 0}
+        
+        cards = self.manager._unseen(cards)
+        for card in cards:
+            if db.is_new_property(card.property_id):
+                self.queue.enqueue(task['cycle_id'], 'detail', {
+                    'site_name': payload['site_name'],
+                    'search_key': payload['search_key'],
+                    'card': card.to_row()
+                }, f"detail:{card.property_id}")
+            else:
+                self.manager._mark_seen(card)
+        
+        if payload['page'] < payload['max_pages']:
+            self.queue.enqueue(
+                task['cycle_id'], 'search_page', {**payload, 'page': payload['page'] + 1},
+                f"page:{task['cycle_id']}:{payload['search_key']}:{payload.get('shard', 0)}:{payload['page'] + 1}",
+                delay=scraper.request_delay
+            )
+        
+        return {'pages': 1, 'found': len(cards)}
+    
+    def _handle_detail(self, task: dict) -> dict:
+        payload = task['payload']
+        card = ListingCard.from_row(payload['card'])
+        is_new = self.manager._process_listing(self._scraper(payload), card, payload['search_key'])
+        return {'new': int(is_new)}
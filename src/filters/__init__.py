@@ -0,0 +1,4 @@
+from .keyword_matcher import KeywordMatcher
+from .property_filter import PropertyFilter
+
+__all__ = ['KeywordMatcher', 'PropertyFilter']
\ No newline at end of file
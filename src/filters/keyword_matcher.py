@@ -0,0 +1,66 @@
+from collections import deque
+from typing import Iterable, List, Set
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.helpers import normalize_text
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output: List[Set[int]] = [set()]
+        
+        for keyword in keywords:
+            normalized = normalize_text(keyword)
+            if normalized:
+                self._add(normalized, len(self.keywords))
+                self.keywords.append(keyword)
+        
+        self._build_failure_links()
+    
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+    
+    def _add(self, pattern: str, index: int):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            node = next_node
+        self._output[node].add(index)
+    
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] |= self._output[self._fail[child]]
+    
+    def find_all(self, text: str, normalized: bool = False) -> Set[str]:
+        if not self.keywords or not text:
+            return set()
+        if not normalized:
+            text = normalize_text(text)
+        
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._output[node]:
+                found |= self._output[node]
+        return {self.keywords[index] for index in found}
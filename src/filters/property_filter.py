@@ -0,0 +1,95 @@
+from collections import Counter, OrderedDict
+from typing import Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from filters.keyword_matcher import KeywordMatcher
+from utils.helpers import normalize_text
+
+class PropertyFilter:
+    def __init__(self, config: dict):
+        config = config or {}
+        self.min_price = config.get('min_price')
+        self.max_price = config.get('max_price')
+        self.currency = config.get('currency', 'USD')
+        self.exchange_rates = config.get('exchange_rates') or {}
+        self.min_size = config.get('min_size')
+        self.max_size = config.get('max_size')
+        self.excluded = KeywordMatcher(config.get('excluded_keywords') or [])
+        self.required = KeywordMatcher(config.get('required_keywords') or [])
+        self.rejected = Counter()
+        self.detail_requests_saved = Counter()
+        self.max_rejected_ids = config.get('max_remembered_rejections', 10000)
+        self._rejected_ids = OrderedDict()
+    
+    def _price(self, prop) -> Optional[float]:
+        if prop.price is None or prop.currency == self.currency:
+            return prop.price
+        # Prices in other currencies are only judged when a rate to the filter currency is configured
+        rate = self.exchange_rates.get(prop.currency)
+        return prop.price * rate if rate else None
+    
+    def check(self, prop, final: bool = True) -> Optional[str]:
+        price = self._price(prop)
+        if price is not None:
+            if self.min_price is not None and price < self.min_price:
+                return 'min_price'
+            if self.max_price is not None and price > self.max_price:
+                return 'max_price'
+        
+        if prop.size is not None:
+            if self.min_size is not None and prop.size < self.min_size:
+                return 'min_size'
+            if self.max_size is not None and prop.size > self.max_size:
+                return 'max_size'
+        
+        if not self.excluded and not self.required:
+            return None
+        
+        text = normalize_text(' '.join(filter(None, [prop.title, prop.location, getattr(prop, 'description', None)])))
+        
+        excluded = self.excluded.find_all(text, normalized=True)
+        if excluded:
+            return f"excluded_keywords:{sorted(excluded)[0]}"
+        
+        # Cards only carry title and location, so a missing required keyword may still be in the description
+        if final and self.required and not self.required.find_all(text, normalized=True):
+            return 'required_keywords'
+        
+        return None
+    
+    def accept_card(self, prop) -> bool:
+        rule = self._rejected_ids.get(prop.property_id)
+        if rule is not None:
+            self._rejected_ids.move_to_end(prop.property_id)
+        else:
+            rule = self.check(prop, final=not prop.detail_url)
+        if rule is None:
+            return True
+        
+        self.rejected[rule] += 1
+        if prop.detail_url:
+            self.detail_requests_saved[rule] += 1
+        return False
+    
+    def accept_detail(self, prop) -> bool:
+        rule = self.check(prop, final=True)
+        if rule is None:
+            return True
+        
+        self.rejected[rule] += 1
+        self._rejected_ids[prop.property_id] = rule
+        while len(self._rejected_ids) > self.max_rejected_ids:
+            self._rejected_ids.popitem(last=False)
+        return False
+    
+    def report(self) -> dict:
+        return {
+            'rejected': dict(self.rejected),
+            'detail_requests_saved': dict(self.detail_requests_saved)
+        }
+    
+    def reset_stats(self):
+        self.rejected.clear()
+        self.detail_requests_saved.clear()
@@ -0,0 +1,5 @@
+from .phash import BKTree, phash, hamming
+from .store import ImageStore
+from .pipeline import ImagePipeline
+
+__all__ = ['BKTree', 'phash', 'hamming', 'ImageStore', 'ImagePipeline']
\ No newline at end of file
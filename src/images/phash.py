@@ -0,0 +1,70 @@
+import math
+from typing import List, Tuple
+
+HASH_SIZE = 8
+SAMPLE_SIZE = 32
+
+_COSINES = [
+    [math.cos((2 * x + 1) * u * math.pi / (2 * SAMPLE_SIZE)) for x in range(SAMPLE_SIZE)]
+    for u in range(HASH_SIZE)
+]
+
+def phash(image) -> int:
+    pixels = list(image.convert('L').resize((SAMPLE_SIZE, SAMPLE_SIZE)).getdata())
+    rows = [pixels[y * SAMPLE_SIZE:(y + 1) * SAMPLE_SIZE] for y in range(SAMPLE_SIZE)]
+    
+    # Separable DCT-II, keeping only the lowest 8x8 frequencies
+    partial = [[sum(value * cosine for value, cosine in zip(row, _COSINES[u])) for u in range(HASH_SIZE)] for row in rows]
+    coefficients = [
+        sum(partial[y][u] * _COSINES[v][y] for y in range(SAMPLE_SIZE))
+        for v in range(HASH_SIZE)
+        for u in range(HASH_SIZE)
+    ]
+    
+    median = sorted(coefficients[1:])[len(coefficients[1:]) // 2]
+    value = 0
+    for coefficient in coefficients:
+        value = (value << 1) | (coefficient > median)
+    return value
+
+def hamming(first: int, second: int) -> int:
+    return bin(first ^ second).count('1')
+
+class BKTree:
+    def __init__(self):
+        self._root = None
+        self.size = 0
+    
+    def add(self, value: int, item):
+        self.size += 1
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+        
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+    
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, object]]:
+        if self._root is None:
+            return []
+        
+        results = []
+        stack = [self._root]
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                results.extend((distance, item) for item in items)
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(results, key=lambda result: result[0])
\ No newline at end of file
@@ -0,0 +1,143 @@
+import io
+import logging
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from images.phash import BKTree, phash
+from images.store import ImageStore
+from utils.rate_limiter import RateLimiter
+
+class ImagePipeline(threading.Thread):
+    def __init__(self, db, config: dict):
+        if Image is None:
+            raise ImportError("Pillow is required for the image pipeline (pip install Pillow)")
+        super().__init__(name='homeus-images', daemon=True)
+        
+        self.db = db
+        self.max_images = config.get('max_images_per_listing', 5)
+        self.thumbnail_size = config.get('thumbnail_size', 320)
+        self.max_distance = config.get('max_hamming_distance', 6)
+        self.min_matching_images = config.get('min_matching_images', 2)
+        self.max_workers = config.get('max_concurrent_downloads', 4)
+        self.timeout = config.get('timeout', 15)
+        self.store = ImageStore(config.get('path', 'data/images'), int(config.get('max_store_mb', 500) * 1024 * 1024))
+        self.rate_limiter = RateLimiter(config.get('requests_per_minute', 60))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='homeus-image')
+        # requests.Session is not thread-safe, so each download thread keeps its own
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        
+        self.index = BKTree()
+        for property_id, value in db.iter_image_hashes():
+            self.index.add(int(value, 16), property_id)
+    
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
+    def submit(self, prop, link_reposts: bool = False):
+        # Downloads are rate limited, so they run behind the scraper and link reposts once they finish
+        urls = list(dict.fromkeys(prop.images))[:self.max_images]
+        if urls:
+            self._queue.put((prop.property_id, urls, link_reposts))
+    
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._handle(*self._queue.get(timeout=1))
+            except queue.Empty:
+                pass
+    
+    def stop(self, timeout: float = 30):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.pending_count():
+            logging.info(f"Image pipeline stopped with {self.pending_count()} listings not yet hashed")
+    
+    def flush(self):
+        while True:
+            try:
+                self._handle(*self._queue.get_nowait())
+            except queue.Empty:
+                break
+    
+    def _handle(self, property_id: str, urls: List[str], link_reposts: bool):
+        try:
+            matches = self.process(property_id, urls)
+            if matches and link_reposts:
+                self._link_repost(property_id, matches)
+        except Exception as e:
+            logging.error(f"Error processing images for {property_id}: {e}")
+    
+    def _link_repost(self, property_id: str, matches: List[str]):
+        # A listing already linked by its text keeps that canonical
+        if self.db.get_canonical_id(property_id) != property_id:
+            return
+        canonical_id = self.db.get_canonical_id(matches[0]) or matches[0]
+        self.db.set_canonical_id(property_id, canonical_id)
+        logging.info(f"{property_id} shares photos with {canonical_id}")
+    
+    def _fetch(self, url: str) -> Optional[Tuple[str, str, int]]:
+        self.rate_limiter.acquire()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            
+            with Image.open(io.BytesIO(response.content)) as image:
+                image.thumbnail((self.thumbnail_size, self.thumbnail_size))
+                hash_value = phash(image)
+                buffer = io.BytesIO()
+                image.convert('RGB').save(buffer, 'JPEG', quality=80)
+            
+            return url, self.store.put(buffer.getvalue()), hash_value
+        except Exception as e:
+            logging.warning(f"Could not fetch image {url}: {e}")
+            return None
+    
+    def process(self, property_id: str, urls: List[str]) -> List[str]:
+        fetched = [result for result in self._executor.map(self._fetch, urls) if result]
+        
+        matches = self.find_matches([hash_value for _, _, hash_value in fetched], exclude=property_id)
+        self.db.save_image_hashes(property_id, [(url, digest, f"{hash_value:016x}") for url, digest, hash_value in fetched])
+        
+        with self._lock:
+            for _, _, hash_value in fetched:
+                self.index.add(hash_value, property_id)
+        return matches
+    
+    def find_matches(self, hashes: List[int], exclude: str = None) -> List[str]:
+        if not hashes:
+            return []
+        
+        counts = Counter()
+        with self._lock:
+            for hash_value in hashes:
+                for property_id in {item for _, item in self.index.search(hash_value, self.max_distance)}:
+                    if property_id != exclude:
+                        counts[property_id] += 1
+        
+        needed = min(self.min_matching_images, len(hashes))
+        return [property_id for property_id, count in counts.most_common() if count >= needed]
\ No newline at end of file
@@ -0,0 +1,69 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+class ImageStore:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.total_bytes = sum(path.stat().st_size for path in self.root.glob('*/*.jpg'))
+    
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.jpg"
+    
+    def has(self, digest: str) -> bool:
+        return self.path(digest).exists()
+    
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        
+        with self._lock:
+            if path.exists():
+                os.utime(path)
+                return digest
+            
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self.total_bytes += len(data)
+            
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+        
+        return digest
+    
+    def read(self, digest: str) -> Optional[bytes]:
+        path = self.path(digest)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+    
+    def _evict(self):
+        # Least recently used first, down to 90% of the budget so eviction does not run on every write
+        files = sorted(
+            ((entry.stat().st_mtime, entry.stat().st_size, entry) for entry in self.root.glob('*/*.jpg')),
+            key=lambda item: item[0]
+        )
+        target = self.max_bytes * 0.9
+        removed = 0
+        for _, size, entry in files:
+            if self.total_bytes <= target:
+                break
+            try:
+                entry.unlink()
+                self.total_bytes -= size
+                removed += 1
+            except OSError as e:
+                logging.warning(f"Could not evict thumbnail {entry}: {e}")
+        
+        logging.info(f"Evicted {removed} thumbnails, image store now {self.total_bytes / 1024 / 1024:.1f} MB")
\ No newline at end of file
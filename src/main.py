@@ -1,108 +1,598 @@
-import schedule
 import time
 import logging
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from scraper.myhome_scraper import MyHomeScraper
 from scraper.ss_scraper import SSScraper
+from scraper.sharding import PriceSharder
 from storage.database import Database
 from storage.sheets_manager import SheetsManager
-from utils.logger import setup_logger
-from utils.config import load_config
+from storage.outbox import OutboxWorker
+from filters.property_filter import PropertyFilter
+from dedup.detector import DuplicateDetector
+from images.pipeline import ImagePipeline
+from scoring.deal_scorer import DealScorer
+from notifications.dispatcher import NotificationDispatcher
+from scheduler.adaptive_scheduler import AdaptiveScheduler
+from api.server import ApiServer
+from distributed import QueueCoordinator, QueueWorker, build_work_queue
+from utils.logger import log_context, setup_logger, stop_logging
+from utils.config import load_config, validate_config, ConfigWatcher
+from utils.profiling import Profiler
+from utils.memory import MemoryMonitor, release_free_memory, rss_bytes
+from utils.metrics import REGISTRY, CACHE_HITS, NEW_LISTINGS, QUEUE_DEPTH, MetricsServer, stage_delta, stage_totals, timed
+
+# Bound at startup: open connections, listening sockets, signal handlers, restart bookkeeping
+RESTART_SECTIONS = {'database': 'Database', 'metrics': 'Metrics', 'api': 'API', 'profiling': 'Profiling', 'memory': 'Memory'}
 
 class HomeusManager:
     def __init__(self, config_path: str):
         self.config = load_config(config_path)
+        validate_config(self.config)
+        self.config_watcher = ConfigWatcher(config_path)
+        self.monitoring = False
+        self.metrics_server = None
+        self.api_server = None
         self.logger = setup_logger(self.config['logging'])
         self.db = Database(self.config['database']['path'])
-        self.sheets = SheetsManager(self.config['google_sheets']) if self.config['google_sheets']['enabled'] else None
+        self._init_sinks()
+        self.property_filter = self._init_filter()
+        self.dedup = self._init_dedup()
+        self.images = self._init_images()
+        self.scorer = self._init_scorer()
+        self.notifier = self._init_notifier()
         self.scrapers = self._init_scrapers()
+        self.sharder = self._init_sharder()
+        self.scheduler = AdaptiveScheduler(self.config['scraping'])
+        self.profiler = Profiler(self.config.get('profiling') or {})
+        self.memory = MemoryMonitor(self.config.get('memory') or {})
+    
+    def _init_sinks(self):
+        self.sheets = SheetsManager(self.config['google_sheets']) if self.config['google_sheets']['enabled'] else None
+        self.outbox_worker = self._init_outbox()
+        self.sink_events = list(self.outbox_worker.sinks) if self.outbox_worker else None
+    
+    def _init_filter(self):
+        return PropertyFilter(self.config['filters']) if self.config.get('filters') else None
+    
+    def start_metrics(self):
+        metrics_config = self.config.get('metrics', {})
+        if not metrics_config.get('enabled', False) or self.metrics_server:
+            return
         
-    def _init_scrapers(self):
+        REGISTRY.add_collector(self._collect_queue_depths)
+        self.metrics_server = MetricsServer(
+            metrics_config.get('host', '127.0.0.1'), metrics_config.get('port', 9108),
+            admin={'/admin/profile': self.profiler.handle_admin}
+        )
+        self.metrics_server.start()
+    
+    def start_api(self):
+        api_config = self.config.get('api', {})
+        if not api_config.get('enabled', False) or self.api_server:
+            return
+        
+        self.api_server = ApiServer(self.db, api_config)
+        self.api_server.start()
+    
+    def _collect_queue_depths(self):
+        if self.outbox_worker:
+            for sink, backlog in self.outbox_worker.backlog().items():
+                QUEUE_DEPTH.set(backlog, queue=f"outbox_{sink}")
+        if self.sheets:
+            QUEUE_DEPTH.set(self.sheets.pending_count(), queue='sheets_buffer')
+        if self.notifier:
+            QUEUE_DEPTH.set(self.notifier.pending_count(), queue='notifications')
+        if self.images:
+            QUEUE_DEPTH.set(self.images.pending_count(), queue='images')
+    
+    def _init_dedup(self):
+        dedup_config = self.config.get('dedup', {})
+        return DuplicateDetector(self.db, dedup_config) if dedup_config.get('enabled', False) else None
+    
+    def _init_images(self):
+        images_config = self.config.get('images', {})
+        if not images_config.get('enabled', False):
+            return None
+        try:
+            return ImagePipeline(self.db, images_config)
+        except ImportError as e:
+            self.logger.warning(f"Image pipeline disabled: {e}")
+            return None
+    
+    def _init_scorer(self):
+        scoring_config = self.config.get('scoring', {})
+        if not scoring_config.get('enabled', False):
+            return None
+        try:
+            return DealScorer(self.db, scoring_config)
+        except ImportError as e:
+            self.logger.warning(f"Deal scoring disabled: {e}")
+            return None
+    
+    def score_new_listings(self):
+        if not self.scorer:
+            return
+        
+        with timed('all', 'scoring'):
+            scored = self.scorer.score_new(sink_events=self.sink_events)
+        if not scored:
+            return
+        
+        if self.sheets and not self.outbox_worker:
+            for property_id, deal_score in scored:
+                self.sheets.update_property_score(property_id, deal_score)
+        best_id, best_score = max(scored, key=lambda item: item[1])
+        self.logger.info(f"Scored {len(scored)} new listings against market baselines; best deal {best_id} ({best_score:+.2f})")
+    
+    def backfill_duplicates(self, limit: Optional[int] = None):
+        if not self.dedup or self.dedup.backfill_done:
+            return
+        indexed = self.dedup.backfill(limit=limit)
+        if indexed:
+            self.logger.info(f"Indexed {indexed} stored properties for duplicate detection")
+    
+    def backfill_duplicates_step(self) -> bool:
+        # Indexes old properties a batch at a time between cycles instead of holding up the first one
+        self.backfill_duplicates(self.config.get('dedup', {}).get('backfill_batch', 500))
+        return bool(self.dedup) and not self.dedup.backfill_done
+    
+    def _init_notifier(self):
+        notifications_config = self.config.get('notifications', {})
+        if not notifications_config.get('enabled', False):
+            return None
+        
+        notifier = NotificationDispatcher(notifications_config)
+        if not notifier.channels:
+            self.logger.warning("Notifications enabled but no channel is configured")
+        self.logger.info(f"Loaded {len(notifier.rules.rules)} alert rules for channels: {', '.join(notifier.channels) or 'none'}")
+        return notifier
+    
+    def _init_outbox(self):
+        outbox_config = self.config.get('outbox', {})
+        if not outbox_config.get('enabled', False) or not self.sheets:
+            return None
+        return OutboxWorker(self.db, {'sheets': self.sheets}, outbox_config)
+    
+    def _init_scrapers(self, previous: dict = None):
         scrapers = {}
         for site_name, site_config in self.config['websites'].items():
-            if site_name == 'myhome':
+            if previous and site_name in previous and previous[site_name].config == site_config:
+                scrapers[site_name] = previous[site_name]
+            elif site_name == 'myhome':
                 scrapers[site_name] = MyHomeScraper(site_config)
             elif site_name == 'ss':
                 scrapers[site_name] = SSScraper(site_config)
+        
+        for scraper in scrapers.values():
+            scraper.card_filter = self.property_filter
+            scraper.is_known = lambda property_id: not self.db.is_new_property(property_id)
+            scraper.request_delay = self.config['scraping'].get('delay_between_requests', 2)
+            scraper.request_timeout = self.config['scraping'].get('timeout', 30)
         return scrapers
     
-    def run_scraping_cycle(self):
-        self.logger.info("Starting scraping cycle")
-        session_id = self.db.start_scraping_session()
+    def _init_sharder(self) -> PriceSharder:
+        return PriceSharder(
+            self.config['scraping'].get('sharding') or {},
+            max_workers=self.config.get('performance', {}).get('max_concurrent_requests', 3)
+        )
+    
+    def _all_searches(self) -> List[tuple]:
+        return [
+            (site_name, search_config)
+            for site_name in self.scrapers
+            for search_config in self.config['websites'][site_name]['search_urls']
+        ]
+    
+    def _search_key(self, site_name: str, search_config: dict) -> str:
+        return f"{site_name}:{search_config['name']}"
+    
+    def recover_interrupted_cycles(self):
+        orphaned = self.db.get_orphaned_sessions()
+        if not orphaned:
+            return
+        
+        *stale, latest = orphaned
+        for session_id in stale:
+            self.db.abort_scraping_session(session_id, "Interrupted, superseded by a later cycle")
+        
+        checkpoints = self.db.get_cycle_checkpoints(latest)
+        searches_by_key = {self._search_key(*search): search for search in self._all_searches()}
+        searches = [searches_by_key[key] for key in checkpoints if key in searches_by_key]
+        
+        if not any(not checkpoints[self._search_key(*search)]['completed'] for search in searches):
+            self.db.abort_scraping_session(latest, "Interrupted with no resumable work")
+            self.logger.warning(f"Closed interrupted scraping session {latest}")
+            return
+        
+        self.run_scraping_cycle(searches, session_id=latest)
+    
+    def run_scraping_cycle(self, searches: List[tuple] = None, session_id: int = None) -> dict:
+        searches = searches or self._all_searches()
+        if session_id is None:
+            self.logger.info("Starting scraping cycle")
+            session_id = self.db.start_scraping_session()
+            self.db.plan_cycle(session_id, [self._search_key(*search) for search in searches])
+        else:
+            self.logger.info(f"Resuming interrupted scraping cycle {session_id}")
+        results = {}
+        timings_before = stage_totals()
+        profile = self.profiler.start_cycle(session_id)
+        memory = self.memory.start_cycle()
+        self.cycle_seen = set()
+        self.duplicates_skipped = 0
+        for scraper in self.scrapers.values():
+            scraper.session.begin_cycle()
         
         try:
             new_properties_count = 0
             total_properties_count = 0
+            checkpoints = self.db.get_cycle_checkpoints(session_id)
             
-            for site_name, scraper in self.scrapers.items():
-                site_config = self.config['websites'][site_name]
+            for site_name, search_config in searches:
+                scraper = self.scrapers.get(site_name)
+                if scraper is None:
+                    continue
                 
-                for search_config in site_config['search_urls']:
-                    self.logger.info(f"Scraping: {search_config['name']}")
-                    
-                    properties = scraper.scrape_listings(
-                        search_config['url'], 
-                        max_pages=self.config['scraping'].get('max_pages', 5)
-                    )
-                    total_properties_count += len(properties)
-                    
-                    for prop in properties:
-                        if self.db.is_new_property(prop.property_id):
-                            if prop.detail_url:
-                                try:
-                                    detailed_prop = scraper.scrape_property_details(prop.detail_url)
-                                    if detailed_prop:
-                                        prop = detailed_prop
-                                except Exception as e:
-                                    self.logger.warning(f"Failed to get details for {prop.property_id}: {e}")
-                            
-                            self.db.save_property(prop)
-                            
-                            if self.sheets:
-                                self.sheets.add_property(prop)
-                            
-                            new_properties_count += 1
-                            self.logger.info(f"New property: {prop.title} - {prop.price} {prop.currency}")
-                        else:
-                            self.db.update_property_last_seen(prop.property_id)
+                search_key = self._search_key(site_name, search_config)
+                checkpoint = checkpoints.get(search_key, {})
+                if checkpoint.get('completed'):
+                    totals = checkpoint
+                else:
+                    with log_context(cycle=session_id, site=site_name, search=search_config['name']):
+                        totals = self._scrape_search(session_id, search_key, scraper, search_config, checkpoint)
+                
+                total_properties_count += totals['properties_found']
+                new_properties_count += totals['new_properties']
+                results[search_key] = totals['new_properties']
             
-            self.db.finish_scraping_session(session_id, total_properties_count, new_properties_count)
+            self.score_new_listings()
+            self._mark_delisted()
+            self._flush_sheets()
+            self._report_filters()
+            self._report_coalescing()
+            self.db.finish_scraping_session(session_id, total_properties_count, new_properties_count,
+                                            stage_timings=stage_delta(timings_before), slow_functions=profile.stop(),
+                                            peak_memory_mb=memory.stop())
             self.logger.info(f"Cycle completed. Found {total_properties_count} properties, {new_properties_count} new")
             
         except Exception as e:
-            self.db.finish_scraping_session(session_id, 0, 0, str(e))
+            self._flush_sheets()
+            self.db.finish_scraping_session(session_id, 0, 0, str(e), stage_timings=stage_delta(timings_before),
+                                            slow_functions=profile.stop(), peak_memory_mb=memory.stop())
             self.logger.error(f"Scraping cycle failed: {e}")
+        
+        return results
+    
+    def _scrape_search(self, session_id: int, search_key: str, scraper, search_config: dict, checkpoint: dict) -> dict:
+        if not checkpoint.get('listing_done'):
+            max_pages = self.config['scraping'].get('max_pages', 5)
+            on_page = lambda page, cards: self._save_page(session_id, search_key, page, cards)
+            
+            if self.sharder.enabled:
+                # Shards are re-crawled from the first page on resume; pending listings are already de-duplicated
+                self.logger.info(f"Scraping: {search_config['name']} (price-sharded)")
+                self.sharder.scrape_listings(scraper, search_config['url'], max_pages, on_page=on_page)
+            else:
+                start_page = checkpoint.get('last_page', 0) + 1
+                if start_page > 1:
+                    self.logger.info(f"Scraping: {search_config['name']} (resuming at page {start_page})")
+                else:
+                    self.logger.info(f"Scraping: {search_config['name']}")
+                
+                scraper.scrape_listings(search_config['url'], max_pages=max_pages, start_page=start_page, on_page=on_page)
+            self.db.mark_listing_done(session_id, search_key)
+        
+        for card in self.db.get_pending_listings(session_id, search_key):
+            is_new = self._process_listing(scraper, card, search_key)
+            self.db.resolve_pending_listing(session_id, search_key, card.property_id, is_new)
+        
+        return self.db.complete_search_checkpoint(session_id, search_key)
+    
+    def _save_page(self, session_id: int, search_key: str, page: int, cards: List):
+        with timed('all', 'db_write'):
+            self.db.save_page_checkpoint(session_id, search_key, page, self._unseen(cards))
+    
+    def _unseen(self, properties: List) -> List:
+        # Overlapping searches return the same listings; each property_id is handled once per cycle
+        unseen = []
+        for prop in properties:
+            if prop.property_id in self.cycle_seen:
+                self.duplicates_skipped += 1
+                continue
+            self.cycle_seen.add(prop.property_id)
+            unseen.append(prop)
+        return unseen
+    
+    def _report_coalescing(self):
+        totals = {'fetched': 0, 'cache_hits': 0, 'coalesced': 0}
+        for scraper in self.scrapers.values():
+            stats = scraper.session.end_cycle()
+            CACHE_HITS.inc(stats.get('cache_hits', 0), site=scraper.site_label, kind='cache')
+            CACHE_HITS.inc(stats.get('coalesced', 0), site=scraper.site_label, kind='coalesced')
+            for key, value in stats.items():
+                totals[key] += value
+        self.logger.info(
+            f"Requests: {totals['fetched']} fetched, {totals['cache_hits']} served from cycle cache, "
+            f"{totals['coalesced']} shared in flight; {self.duplicates_skipped} duplicate listings skipped"
+        )
+    
+    def _mark_seen(self, card):
+        if not self.db.update_property_last_seen(card.property_id, card.price, card.currency, sink_events=self.sink_events):
+            return
+        
+        self.logger.info(f"Property {card.property_id} is listed again")
+        if self.sheets and not self.outbox_worker:
+            self.sheets.update_property_status(card.property_id, 'ACTIVE')
+    
+    def _process_listing(self, scraper, card, search_key: Optional[str] = None) -> bool:
+        if not self.db.is_new_property(card.property_id):
+            self._mark_seen(card)
+            return False
+        
+        prop = None
+        if card.detail_url:
+            try:
+                with timed(scraper.site_label, 'detail'):
+                    prop = scraper.scrape_property_details(card.detail_url)
+            except Exception as e:
+                self.logger.warning(f"Failed to get details for {card.property_id}: {e}")
+        if prop is None:
+            prop = card.to_property()
+        
+        if self.property_filter and not self.property_filter.accept_detail(prop):
+            return False
+        
+        is_repost = False
+        if self.dedup:
+            is_repost = self.dedup.assign(prop) != prop.property_id
+        
+        with timed(scraper.site_label, 'db_write'):
+            self.db.save_property(prop, sink_events=self.sink_events, search_key=search_key)
+        NEW_LISTINGS.inc(site=scraper.site_label)
+        
+        if self.images:
+            self.images.submit(prop, link_reposts=self.dedup is not None)
+        
+        if self.sheets and not self.outbox_worker:
+            self.sheets.queue_property(prop)
+        
+        if self.notifier and not (is_repost and not self.config['dedup'].get('notify_duplicates', False)):
+            self.notifier.notify(prop)
+        
+        self.logger.info(f"New property: {prop.title} - {prop.price} {prop.currency}")
+        return True
+    
+    def _report_filters(self):
+        if not self.property_filter:
+            return
+        
+        report = self.property_filter.report()
+        self.property_filter.reset_stats()
+        if not report['rejected']:
+            return
+        
+        saved = report['detail_requests_saved']
+        rules = ', '.join(f"{rule}: {count} rejected/{saved.get(rule, 0)} details saved" for rule, count in sorted(report['rejected'].items()))
+        self.logger.info(f"Filters rejected {sum(report['rejected'].values())} listings, saving {sum(saved.values())} detail requests ({rules})")
+    
+    def _mark_delisted(self):
+        delist_after_hours = self.config['scraping'].get('delist_after_hours')
+        if not delist_after_hours:
+            return
+        
+        delisted_ids = self.db.deactivate_stale_properties(delist_after_hours, sink_events=self.sink_events)
+        if not delisted_ids:
+            return
+        
+        self.logger.info(f"Marked {len(delisted_ids)} properties as delisted")
+        if self.sheets and not self.outbox_worker:
+            for property_id in delisted_ids:
+                self.sheets.update_property_status(property_id, 'DELISTED')
+    
+    def _flush_sheets(self):
+        if not self.sheets or self.outbox_worker or not self.sheets.pending_count():
+            return
+        
+        if not self.sheets.flush():
+            self.logger.warning(f"{self.sheets.pending_count()} Google Sheets writes left in the buffer, retrying next cycle")
+    
+    def check_memory(self):
+        self.memory.report_growth()
+        if not self.memory.over_budget():
+            self.memory.reset_restarts()
+            return
+        
+        self.cycle_seen = set()
+        for scraper in self.scrapers.values():
+            scraper.session.end_cycle()
+            scraper.session.close()
+        release_free_memory()
+        
+        rss_mb = self.memory.over_budget()
+        if not rss_mb:
+            self.memory.reset_restarts()
+            self.logger.info(f"Memory back under budget after cleanup ({rss_bytes() / 1024 / 1024:.0f} MB)")
+            return
+        
+        self.logger.warning(f"RSS {rss_mb:.0f} MB still over budget after cleanup")
+        if self.memory.restart_allowed():
+            self.memory.record_restart()
+            self.restart()
+    
+    def restart(self):
+        self.logger.warning("Restarting process")
+        self._flush_sheets()
+        if self.outbox_worker:
+            self.outbox_worker.stop()
+        if self.notifier:
+            self.notifier.stop()
+        if self.images:
+            self.images.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.api_server:
+            self.api_server.stop()
+        stop_logging()
+        logging.shutdown()
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+    
+    def drain_pending(self):
+        if self.outbox_worker:
+            delivered = self.outbox_worker.drain()
+            backlog = sum(self.outbox_worker.backlog().values())
+            self.logger.info(f"Delivered {delivered} outbox events, {backlog} still pending")
+        
+        if self.notifier:
+            self.notifier.flush()
+        
+        if self.images:
+            self.images.flush()
+    
+    def check_config_reload(self):
+        try:
+            new_config = self.config_watcher.poll()
+        except Exception as e:
+            self.logger.error(f"Ignoring config change, keeping the running configuration: {e}")
+            return
+        
+        if new_config:
+            self.apply_config(new_config)
+    
+    def apply_config(self, new_config: dict):
+        old_config = self.config
+        changed = {key for key in set(old_config) | set(new_config) if old_config.get(key) != new_config.get(key)}
+        if not changed:
+            return
+        
+        for section in sorted(changed & set(RESTART_SECTIONS)):
+            self.logger.warning(f"{RESTART_SECTIONS[section]} settings changed; restart Homeus to apply them")
+            if section in old_config:
+                new_config[section] = old_config[section]
+            else:
+                new_config.pop(section, None)
+            changed.discard(section)
+        
+        self.config = new_config
+        if not changed:
+            return
+        self.logger.info(f"Reloading configuration sections: {', '.join(sorted(changed))}")
+        
+        if 'logging' in changed:
+            self.logger = setup_logger(self.config['logging'])
+        
+        if changed & {'google_sheets', 'outbox'}:
+            if self.outbox_worker:
+                self.outbox_worker.stop()
+            elif self.sheets and self.sheets.pending_count() and not self.sheets.flush():
+                self.logger.warning(f"Dropping {self.sheets.pending_count()} buffered Google Sheets writes from the old configuration")
+            self._init_sinks()
+            if self.monitoring and self.outbox_worker:
+                self.outbox_worker.start()
+        
+        if 'notifications' in changed:
+            if self.notifier:
+                self.notifier.stop()
+            self.notifier = self._init_notifier()
+            if self.monitoring and self.notifier:
+                self.notifier.start()
+        
+        if 'filters' in changed:
+            self.property_filter = self._init_filter()
+        
+        if 'dedup' in changed:
+            self.dedup = self._init_dedup()
+        
+        if 'images' in changed:
+            if self.images:
+                self.images.stop()
+            self.images = self._init_images()
+            if self.monitoring and self.images:
+                self.images.start()
+        
+        if 'scoring' in changed:
+            self.scorer = self._init_scorer()
+        
+        if changed & {'websites', 'filters', 'scraping'}:
+            self.scrapers = self._init_scrapers(previous=self.scrapers)
+        
+        if changed & {'scraping', 'performance'}:
+            self.sharder = self._init_sharder()
+        
+        if 'scraping' in changed:
+            self.scheduler.configure(self.config['scraping'])
+        if changed & {'websites', 'scraping'}:
+            self.scheduler.sync(self._all_searches())
     
     def start_monitoring(self):
         self.logger.info("Starting Homeus monitoring...")
+        self.monitoring = True
         
-        schedule.every(self.config['scraping']['interval_minutes']).minutes.do(self.run_scraping_cycle)
+        if self.outbox_worker:
+            self.outbox_worker.start()
+        if self.notifier:
+            self.notifier.start()
+        if self.images:
+            self.images.start()
+        self.start_metrics()
+        self.start_api()
+        self.profiler.install_signal_handlers()
         
-        self.run_scraping_cycle()
+        self.recover_interrupted_cycles()
+        self.scheduler.sync(self._all_searches())
         
         while True:
-            schedule.run_pending()
-            time.sleep(30)
+            self.check_config_reload()
+            
+            due = self.scheduler.due()
+            if due:
+                results = self.run_scraping_cycle([(entry.site_name, entry.search_config) for entry in due])
+                for entry in due:
+                    self.scheduler.record_result(entry.key, results.get(entry.key, 0))
+                for entry in self.scheduler.snapshot():
+                    self.logger.debug(f"Next run of {entry['search']} in {entry['interval_minutes']} min ({entry['new_per_hour']} new/hour)")
+                self.check_memory()
+            elif self.backfill_duplicates_step():
+                continue
+            
+            time.sleep(min(30, max(1, self.scheduler.seconds_until_next())))
 
 def main():
     parser = argparse.ArgumentParser(description='Homeus Property Scraper')
     parser.add_argument('--config', default='config/config.yaml', help='Configuration file path')
     parser.add_argument('--once', action='store_true', help='Run once and exit')
+    parser.add_argument('--coordinator', action='store_true', help='Schedule searches into the shared work queue')
+    parser.add_argument('--worker', action='store_true', help='Process tasks from the shared work queue')
+    parser.add_argument('--worker-id', help='Worker name used for task leases (default: hostname-pid)')
+    parser.add_argument('--api', action='store_true', help='Only serve the read API over the database')
     
     args = parser.parse_args()
     
     try:
+        if args.api:
+            config = load_config(args.config)
+            setup_logger(config['logging'])
+            server = ApiServer(Database.open_readonly(config['database']['path']), config.get('api', {}))
+            server.run()
+            return
+        
         manager = HomeusManager(args.config)
         
-        if args.once:
+        if args.coordinator:
+            QueueCoordinator(manager, build_work_queue(manager.config)).run()
+        elif args.worker:
+            QueueWorker(manager, build_work_queue(manager.config), args.worker_id).run()
+        elif args.once:
+            manager.backfill_duplicates()
+            manager.recover_interrupted_cycles()
             manager.run_scraping_cycle()
+            manager.drain_pending()
         else:
             manager.start_monitoring()
             
@@ -1,3 +1,4 @@
 from .property import Property
+from .listing_card import ListingCard
 
-__all__ = ['Property'] 
\ No newline at end of file
+__all__ = ['Property', 'ListingCard']
\ No newline at end of file
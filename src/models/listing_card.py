@@ -0,0 +1,66 @@
+import json
+from typing import Optional, Sequence
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.property import Property
+from utils.helpers import extract_district
+
+class ListingCard:
+    __slots__ = (
+        'property_id', 'title', 'price', 'currency', 'location', 'size', 'rooms',
+        'property_type', 'source_url', 'detail_url', 'images'
+    )
+    
+    def __init__(self, property_id: str, title: str, price: Optional[int] = None, currency: str = "USD",
+                 location: str = "Unknown", size: Optional[float] = None, rooms: Optional[int] = None,
+                 property_type: str = "apartment", source_url: str = "", detail_url: Optional[str] = None,
+                 images: Sequence[str] = ()):
+        self.property_id = property_id
+        self.title = title
+        self.price = price
+        self.currency = currency
+        self.location = location
+        self.size = size
+        self.rooms = rooms
+        self.property_type = property_type
+        self.source_url = source_url
+        self.detail_url = detail_url
+        self.images = images
+    
+    def __repr__(self) -> str:
+        return f"ListingCard({self.property_id!r}, {self.title!r}, {self.price!r} {self.currency})"
+    
+    def to_row(self) -> tuple:
+        return (
+            self.property_id, self.title, self.price, self.currency, self.location, self.size, self.rooms,
+            self.property_type, self.source_url, self.detail_url, list(self.images)
+        )
+    
+    @classmethod
+    def from_row(cls, row) -> 'ListingCard':
+        if isinstance(row, dict):
+            # Payloads written before cards were stored as row tuples
+            images = row.get('images') or '[]'
+            return cls(
+                **{name: row.get(name) for name in cls.__slots__ if name != 'images'},
+                images=json.loads(images) if isinstance(images, str) else images
+            )
+        return cls(*row)
+    
+    def to_property(self) -> Property:
+        return Property(
+            property_id=self.property_id,
+            title=self.title,
+            price=self.price,
+            currency=self.currency,
+            location=self.location,
+            district=extract_district(self.location, self.title),
+            size=self.size,
+            rooms=self.rooms,
+            property_type=self.property_type,
+            source_url=self.source_url,
+            detail_url=self.detail_url,
+            images=list(self.images)
+        )
\ No newline at end of file
@@ -24,11 +24,38 @@ class Property(BaseModel):
     listing_date: Optional[datetime] = None
     scraped_at: datetime = Field(default_factory=datetime.now)
     is_new: bool = True
+    canonical_id: Optional[str] = None
+    deal_score: Optional[float] = None
     
     def generate_hash(self) -> str:
         content = f"{self.title}{self.price}{self.location}{self.size}{self.rooms}"
         return hashlib.md5(content.encode()).hexdigest()
     
+    @classmethod
+    def from_db_row(cls, row: dict) -> 'Property':
+        return cls(
+            property_id=row['property_id'],
+            title=row['title'],
+            price=row['price'],
+            currency=row['currency'],
+            location=row['location'],
+            district=row['district'],
+            size=row['size'],
+            rooms=row['rooms'],
+            bedrooms=row['bedrooms'],
+            floor=row['floor'],
+            total_floors=row['total_floors'],
+            property_type=row['property_type'],
+            description=row['description'],
+            images=json.loads(row['images']) if row['images'] else [],
+            source_url=row['source_url'],
+            detail_url=row['detail_url'],
+            listing_date=datetime.fromisoformat(row['listing_date']) if row['listing_date'] else None,
+            scraped_at=datetime.fromisoformat(row['scraped_at']),
+            canonical_id=row.get('canonical_id'),
+            deal_score=row.get('deal_score')
+        )
+    
     def to_dict(self) -> dict:
         data = self.model_dump()
         data['images'] = json.dumps(self.images)
@@ -0,0 +1,5 @@
+from .alert_rules import AlertRule, RuleIndex
+from .channels import TelegramChannel, EmailChannel
+from .dispatcher import NotificationDispatcher
+
+__all__ = ['AlertRule', 'RuleIndex', 'TelegramChannel', 'EmailChannel', 'NotificationDispatcher']
\ No newline at end of file
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from filters.keyword_matcher import KeywordMatcher
+from utils.helpers import normalize_text
+
+ANY_CURRENCY = '*'
+
+class AlertRule:
+    def __init__(self, config: dict):
+        self.name = config['name']
+        self.channels: List[str] = config.get('channels') or ['telegram']
+        self.recipients: Dict[str, str] = config.get('recipients') or {}
+        self.currency: Optional[str] = config.get('currency')
+        self.min_price = config.get('min_price')
+        self.max_price = config.get('max_price')
+        self.min_size = config.get('min_size')
+        self.max_size = config.get('max_size')
+        self.rooms = set(config.get('rooms') or [])
+        self.districts = KeywordMatcher(config.get('districts') or [])
+        self.keywords = KeywordMatcher(config.get('keywords') or [])
+    
+    def matches(self, prop) -> bool:
+        if self.currency and prop.currency != self.currency:
+            return False
+        
+        if self.min_price is not None or self.max_price is not None:
+            if prop.price is None:
+                return False
+            if self.min_price is not None and prop.price < self.min_price:
+                return False
+            if self.max_price is not None and prop.price > self.max_price:
+                return False
+        
+        if self.min_size is not None or self.max_size is not None:
+            if prop.size is None:
+                return False
+            if self.min_size is not None and prop.size < self.min_size:
+                return False
+            if self.max_size is not None and prop.size > self.max_size:
+                return False
+        
+        if self.rooms and prop.rooms not in self.rooms:
+            return False
+        
+        if self.districts and not self.districts.find_all(' '.join(filter(None, [prop.district, prop.location]))):
+            return False
+        
+        if self.keywords:
+            text = normalize_text(' '.join(filter(None, [prop.title, prop.location, prop.description])))
+            if not self.keywords.find_all(text, normalized=True):
+                return False
+        
+        return True
+
+class RuleIndex:
+    def __init__(self, rules: List[AlertRule], bucket_size: int = 10000, max_buckets_per_rule: int = 100):
+        self.rules = rules
+        self.bucket_size = bucket_size
+        self._buckets: Dict[str, Dict[int, List[AlertRule]]] = defaultdict(lambda: defaultdict(list))
+        self._unbounded: Dict[str, List[AlertRule]] = defaultdict(list)
+        
+        for rule in rules:
+            currency = rule.currency or ANY_CURRENCY
+            if rule.max_price is None:
+                self._unbounded[currency].append(rule)
+                continue
+            
+            # YAML may give prices as floats (90000.0, 1.5e5); range() needs ints
+            first = int((rule.min_price or 0) // bucket_size)
+            last = int(rule.max_price // bucket_size)
+            if last - first >= max_buckets_per_rule:
+                self._unbounded[currency].append(rule)
+                continue
+            
+            for bucket in range(first, last + 1):
+                self._buckets[currency][bucket].append(rule)
+    
+    def candidates(self, prop) -> List[AlertRule]:
+        candidates = self._unbounded.get(prop.currency, []) + self._unbounded.get(ANY_CURRENCY, [])
+        if prop.price is not None:
+            bucket = int(prop.price // self.bucket_size)
+            for currency in (prop.currency, ANY_CURRENCY):
+                if currency in self._buckets:
+                    candidates += self._buckets[currency].get(bucket, [])
+        return candidates
+    
+    def match(self, prop) -> List[AlertRule]:
+        return [rule for rule in self.candidates(prop) if rule.matches(prop)]
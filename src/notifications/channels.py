@@ -0,0 +1,69 @@
+import smtplib
+from email.message import EmailMessage
+from typing import Dict
+
+import requests
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.rate_limiter import RateLimiter
+
+class TelegramChannel:
+    name = 'telegram'
+    
+    def __init__(self, config: dict):
+        self.bot_token = config['bot_token']
+        self.default_recipient = config.get('chat_id')
+        self.api_url = config.get('api_url', 'https://api.telegram.org').rstrip('/')
+        self.timeout = config.get('timeout', 10)
+        self.limiter = RateLimiter(config.get('messages_per_minute', 20), 60)
+    
+    def send(self, recipient: str, subject: str, text: str):
+        response = requests.post(
+            f"{self.api_url}/bot{self.bot_token}/sendMessage",
+            json={'chat_id': recipient, 'text': f"{subject}\n\n{text}", 'disable_web_page_preview': True},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+class EmailChannel:
+    name = 'email'
+    
+    def __init__(self, config: dict):
+        self.smtp_server = config['smtp_server']
+        self.smtp_port = config.get('smtp_port', 587)
+        self.username = config.get('username')
+        self.password = config.get('password')
+        self.use_tls = config.get('use_tls', True)
+        self.sender = config.get('from_email') or self.username
+        self.default_recipient = config.get('to_email')
+        self.timeout = config.get('timeout', 30)
+        self.limiter = RateLimiter(config.get('messages_per_minute', 10), 60)
+    
+    def send(self, recipient: str, subject: str, text: str):
+        message = EmailMessage()
+        message['Subject'] = subject
+        message['From'] = self.sender
+        message['To'] = recipient
+        message.set_content(text)
+        
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+def build_channels(config: dict) -> Dict[str, object]:
+    channels = {}
+    
+    telegram_config = config.get('telegram') or {}
+    if telegram_config.get('enabled', False) and telegram_config.get('bot_token'):
+        channels['telegram'] = TelegramChannel(telegram_config)
+    
+    email_config = config.get('email') or {}
+    if email_config.get('enabled', False) and email_config.get('smtp_server'):
+        channels['email'] = EmailChannel(email_config)
+    
+    return channels
@@ -0,0 +1,122 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from notifications.alert_rules import AlertRule, RuleIndex
+from notifications.channels import build_channels
+from utils.helpers import format_price
+
+class NotificationDispatcher(threading.Thread):
+    def __init__(self, config: dict):
+        super().__init__(name='homeus-notifications', daemon=True)
+        self.channels = build_channels(config)
+        self.rules = RuleIndex(
+            [AlertRule(rule_config) for rule_config in config.get('rules') or []],
+            config.get('price_bucket_size', 10000)
+        )
+        self.digest_interval = config.get('digest_interval_seconds', 300)
+        self.max_digest_size = config.get('max_digest_size', 20)
+        self.max_retries = config.get('max_retries', 3)
+        self.retry_base = config.get('retry_base_seconds', 5)
+        self._queue = queue.Queue()
+        self._digests: Dict[Tuple[str, str, str], List] = {}
+        self._digest_started: Dict[Tuple[str, str, str], float] = {}
+        self._stop_event = threading.Event()
+        self.sent = 0
+        self.failed = 0
+    
+    def notify(self, prop) -> int:
+        matched = self.rules.match(prop)
+        for rule in matched:
+            for channel_name in rule.channels:
+                channel = self.channels.get(channel_name)
+                if channel is None:
+                    continue
+                recipient = rule.recipients.get(channel_name) or channel.default_recipient
+                if recipient:
+                    self._queue.put((channel_name, str(recipient), rule.name, prop))
+        return len(matched)
+    
+    def pending_count(self) -> int:
+        return self._queue.qsize() + sum(len(props) for props in list(self._digests.values()))
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._collect(self._queue.get(timeout=1))
+            except queue.Empty:
+                pass
+            self._send_due()
+    
+    def stop(self, timeout: float = 30):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        self.flush()
+    
+    def flush(self):
+        while True:
+            try:
+                self._collect(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._send_due(force=True)
+    
+    def _collect(self, item):
+        channel_name, recipient, rule_name, prop = item
+        key = (channel_name, recipient, rule_name)
+        self._digests.setdefault(key, []).append(prop)
+        self._digest_started.setdefault(key, time.monotonic())
+    
+    def _send_due(self, force: bool = False):
+        now = time.monotonic()
+        for key in list(self._digests):
+            props = self._digests[key]
+            if force or len(props) >= self.max_digest_size or now - self._digest_started[key] >= self.digest_interval:
+                del self._digests[key]
+                del self._digest_started[key]
+                for start in range(0, len(props), self.max_digest_size):
+                    self._send(key, props[start:start + self.max_digest_size])
+    
+    def _send(self, key: Tuple[str, str, str], props: List):
+        channel_name, recipient, rule_name = key
+        channel = self.channels[channel_name]
+        subject = f"🏠 {rule_name}: {len(props)} new listing{'s' if len(props) != 1 else ''}"
+        text = format_digest(props)
+        
+        for attempt in range(self.max_retries + 1):
+            channel.limiter.acquire()
+            try:
+                channel.send(recipient, subject, text)
+                self.sent += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logging.error(f"Failed to send {channel_name} alert '{rule_name}' to {recipient}: {e}")
+                    return
+                delay = self.retry_base * (2 ** attempt)
+                logging.warning(f"{channel_name} alert '{rule_name}' failed ({e}), retrying in {delay}s")
+                time.sleep(delay)
+
+def format_digest(props: List) -> str:
+    lines = []
+    for prop in props:
+        details = [format_price(prop.price, prop.currency)]
+        if prop.size:
+            details.append(f"{prop.size:g} m²")
+        if prop.rooms:
+            details.append(f"{prop.rooms} rooms")
+        details.append(prop.district or prop.location)
+        
+        lines.append(prop.title)
+        lines.append(' | '.join(details))
+        if prop.detail_url:
+            lines.append(prop.detail_url)
+        lines.append('')
+    return '\n'.join(lines).strip()
@@ -0,0 +1,3 @@
+from .adaptive_scheduler import AdaptiveScheduler, SearchSchedule
+
+__all__ = ['AdaptiveScheduler', 'SearchSchedule']
\ No newline at end of file
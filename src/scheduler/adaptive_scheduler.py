@@ -0,0 +1,133 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+class SearchSchedule:
+    def __init__(self, key: str, site_name: str, search_config: dict, interval: float, next_run: float):
+        self.key = key
+        self.site_name = site_name
+        self.search_config = search_config
+        self.interval = interval
+        self.next_run = next_run
+        self.new_per_minute: Optional[float] = None
+        self.last_started: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.running = False
+        self.runs = 0
+
+class AdaptiveScheduler:
+    def __init__(self, config: dict):
+        self._entries: Dict[str, SearchSchedule] = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.configure(config)
+    
+    def configure(self, config: dict):
+        base = config['interval_minutes'] * 60
+        adaptive = config.get('adaptive') or {}
+        self.base_interval = base
+        self.min_interval = adaptive.get('min_interval_minutes', config['interval_minutes']) * 60
+        self.max_interval = max(adaptive.get('max_interval_minutes', config['interval_minutes'] * 6) * 60, self.min_interval)
+        self.target_new_per_run = adaptive.get('target_new_per_run', 3)
+        self.smoothing = adaptive.get('smoothing', 0.3)
+        self.jitter = adaptive.get('jitter', 0.1)
+        
+        with self._lock:
+            for entry in self._entries.values():
+                entry.interval = self._clamp(entry.interval)
+    
+    def sync(self, searches: List[tuple], now: float = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            wanted = {}
+            for site_name, search_config in searches:
+                key = f"{site_name}:{search_config['name']}"
+                wanted[key] = (site_name, search_config)
+            
+            for key in list(self._entries):
+                if key not in wanted:
+                    del self._entries[key]
+            
+            for key, (site_name, search_config) in wanted.items():
+                entry = self._entries.get(key)
+                if entry:
+                    entry.site_name = site_name
+                    entry.search_config = search_config
+                    continue
+                
+                entry = SearchSchedule(key, site_name, search_config, self._clamp(self.base_interval), now)
+                self._entries[key] = entry
+                self._push(entry)
+    
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+    
+    def _push(self, entry: SearchSchedule):
+        heapq.heappush(self._heap, (entry.next_run, next(self._counter), entry.key))
+    
+    def due(self, now: float = None) -> List[SearchSchedule]:
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                next_run, _, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                if entry is None or entry.running or entry.next_run != next_run:
+                    continue
+                entry.running = True
+                entry.started_at = now
+                due.append(entry)
+        return due
+    
+    def seconds_until_next(self, now: float = None) -> float:
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._heap:
+                return self.min_interval
+            return max(0.0, self._heap[0][0] - now)
+    
+    def record_result(self, key: str, new_count: int, now: float = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            
+            if entry.last_started is not None:
+                elapsed_minutes = max((entry.started_at - entry.last_started) / 60, 1e-3)
+                observed = new_count / elapsed_minutes
+                if entry.new_per_minute is None:
+                    entry.new_per_minute = observed
+                else:
+                    entry.new_per_minute = self.smoothing * observed + (1 - self.smoothing) * entry.new_per_minute
+                
+                if entry.new_per_minute > 0:
+                    entry.interval = self._clamp(self.target_new_per_run / entry.new_per_minute * 60)
+                else:
+                    entry.interval = self._clamp(entry.interval * 1.5)
+            
+            entry.last_started = entry.started_at
+            entry.running = False
+            entry.runs += 1
+            
+            # Schedule from completion so a run longer than its interval never queues a backlog
+            jitter = random.uniform(-self.jitter, self.jitter) * entry.interval
+            entry.next_run = now + entry.interval + jitter
+            self._push(entry)
+    
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [
+                {
+                    'search': entry.key,
+                    'interval_minutes': round(entry.interval / 60, 1),
+                    'next_run': entry.next_run,
+                    'new_per_hour': round(entry.new_per_minute * 60, 2) if entry.new_per_minute is not None else None,
+                    'running': entry.running
+                }
+                for entry in sorted(self._entries.values(), key=lambda entry: entry.next_run)
+            ]
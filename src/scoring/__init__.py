@@ -0,0 +1,3 @@
+from .deal_scorer import DealScorer
+
+__all__ = ['DealScorer']
\ No newline at end of file
@@ -0,0 +1,115 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.rollups import rooms_bucket
+
+# Scales the median absolute deviation to a standard deviation for normally distributed prices
+MAD_SCALE = 1.4826
+
+def _group_medians(codes, values, groups: int):
+    order = np.lexsort((values, codes))
+    ordered = values[order]
+    counts = np.bincount(codes, minlength=groups)
+    starts = np.cumsum(counts) - counts
+    return (ordered[starts + (counts - 1) // 2] + ordered[starts + counts // 2]) / 2, counts
+
+def _baseline_keys(district: Optional[str], rooms: Optional[int], currency: Optional[str]) -> Tuple[str, str, str]:
+    # Most specific first: district and rooms, then the whole district, then the whole market
+    district = district or 'other'
+    currency = currency or 'USD'
+    return (f"{district}|{rooms_bucket(rooms)}|{currency}", f"{district}|*|{currency}", f"*|*|{currency}")
+
+class DealScorer:
+    def __init__(self, db, config: dict):
+        if np is None:
+            raise ImportError("NumPy is required for deal scoring (pip install numpy)")
+        
+        self.db = db
+        self.refresh_interval = config.get('refresh_minutes', 60) * 60
+        self.min_samples = config.get('min_samples', 8)
+        self.min_spread = config.get('min_spread', 0.02)
+        self.batch_size = config.get('batch_size', 5000)
+        self._index: Dict[str, int] = {}
+        self._medians = None
+        self._spreads = None
+        self._refreshed_at = None
+        self._last_id = None
+    
+    def refresh(self, force: bool = False) -> int:
+        if not force and self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return len(self._index)
+        
+        samples = self.db.get_market_samples()
+        self._refreshed_at = time.monotonic()
+        if not samples:
+            self._index, self._medians, self._spreads = {}, np.empty(0), np.empty(0)
+            return 0
+        
+        districts, rooms, currencies, prices, sizes = zip(*samples)
+        values = np.asarray(prices, dtype=np.float64) / np.asarray(sizes, dtype=np.float64)
+        keys = [_baseline_keys(*row) for row in zip(districts, rooms, currencies)]
+        
+        # Every listing counts towards all three levels, so all baselines come out of one grouped pass
+        level_keys = np.array([key for level in range(3) for key in (row[level] for row in keys)])
+        level_values = np.tile(values, 3)
+        names, codes = np.unique(level_keys, return_inverse=True)
+        medians, counts = _group_medians(codes, level_values, len(names))
+        mads, _ = _group_medians(codes, np.abs(level_values - medians[codes]), len(names))
+        
+        keep = np.flatnonzero(counts >= self.min_samples)
+        self._index = {str(names[position]): slot for slot, position in enumerate(keep)}
+        self._medians = medians[keep]
+        self._spreads = np.maximum(MAD_SCALE * mads[keep], self.min_spread * medians[keep])
+        logging.info(f"Refreshed deal baselines for {len(self._index)} groups from {len(samples)} listings")
+        return len(self._index)
+    
+    def score(self, rows: List[dict]) -> List[Optional[float]]:
+        self.refresh()
+        if not rows:
+            return []
+        
+        slots = np.full(len(rows), -1, dtype=np.int64)
+        values = np.full(len(rows), np.nan)
+        for position, row in enumerate(rows):
+            if not row['price'] or not row['size'] or row['size'] <= 0:
+                continue
+            for key in _baseline_keys(row['district'], row['rooms'], row['currency']):
+                slot = self._index.get(key)
+                if slot is not None:
+                    slots[position] = slot
+                    values[position] = row['price'] / row['size']
+                    break
+        
+        # Robust z-score: how many spreads the price per m² sits below the group median
+        scored = slots >= 0
+        scores = np.full(len(rows), np.nan)
+        scores[scored] = (self._medians[slots[scored]] - values[scored]) / self._spreads[slots[scored]]
+        return [None if np.isnan(score) else round(float(score), 2) for score in scores]
+    
+    def score_new(self, sink_events: Optional[List[str]] = None) -> List[tuple]:
+        scored = []
+        if self._last_id is None:
+            # Resume after the newest scored listing instead of re-scoring, and re-sending, the whole history
+            self._last_id = self.db.get_last_scored_id()
+        while True:
+            rows = self.db.get_unscored_properties(self._last_id, self.batch_size)
+            if not rows:
+                break
+            self._last_id = rows[-1]['id']
+            scores = [
+                (row['property_id'], score)
+                for row, score in zip(rows, self.score(rows))
+                if score is not None
+            ]
+            self.db.save_deal_scores(scores, sink_events=sink_events)
+            scored += scores
+        return scored
\ No newline at end of file
@@ -1,15 +1,23 @@
 from abc import ABC, abstractmethod
 import requests
-from typing import List, Optional
+from bs4 import BeautifulSoup
+from typing import Callable, List, Optional
+import logging
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.property import Property
+from models.listing_card import ListingCard
+from scraper.coalescing import CoalescingSession
+from utils.metrics import CARDS, PAGES, timed
+from utils.rate_limiter import RateLimiter
 
 class BaseScraper(ABC):
+    site_label = "Base"
+    
     def __init__(self, base_url: str):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = CoalescingSession(requests.Session)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -18,15 +26,105 @@ class BaseScraper(ABC):
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
+        self.card_filter = None
+        self.is_known = None
+        # One limiter per site, shared by every shard thread, keeps the whole site at one page per request_delay
+        self.rate_limiter = RateLimiter(1, 2)
+        self.request_timeout = 30
+    
+    @property
+    def request_delay(self) -> float:
+        return self.rate_limiter.period
+    
+    @request_delay.setter
+    def request_delay(self, seconds: float):
+        self.rate_limiter.period = max(0.0, seconds)
+    
+    def scrape_listings(self, search_url: str, max_pages: int = 5, start_page: int = 1,
+                        on_page: Optional[Callable[[int, List[ListingCard]], None]] = None) -> List[ListingCard]:
+        properties = []
+        page = start_page
+        
+        while page <= max_pages:
+            page_properties = self.scrape_page(search_url, page)
+            if page_properties is None:
+                break
+            
+            # With a callback the pages are handed off as they arrive instead of piling up for the whole search
+            if on_page:
+                on_page(page, page_properties)
+            else:
+                properties.extend(page_properties)
+            page += 1
+        
+        return properties
+    
+    def scrape_page(self, search_url: str, page: int, raise_errors: bool = False) -> Optional[List[ListingCard]]:
+        try:
+            cards = self._fetch_cards(search_url, page)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logging.error(f"Error scraping {self.site_label} page {page}: {e}")
+            return None
+        
+        PAGES.inc(site=self.site_label)
+        CARDS.inc(len(cards), site=self.site_label)
+        if not cards:
+            return None
+        return [card for card in cards if self._accept_card(card)]
+    
+    def count_cards(self, search_url: str, page: int) -> int:
+        # A probe: the cards are neither filtered nor counted as scraped
+        return len(self._fetch_cards(search_url, page))
+    
+    def _fetch_cards(self, search_url: str, page: int) -> List[ListingCard]:
+        self.rate_limiter.acquire()
+        with timed(self.site_label, 'fetch'):
+            response = self.session.get(self._page_url(search_url, page), timeout=self.request_timeout)
+            response.raise_for_status()
+        
+        with timed(self.site_label, 'parse'):
+            soup = BeautifulSoup(response.content, 'html.parser')
+            try:
+                return self._parse_listing_page(soup, search_url)
+            finally:
+                soup.decompose()
     
     @abstractmethod
-    def scrape_listings(self, search_url: str, max_pages: int = 5) -> List[Property]:
+    def _page_url(self, search_url: str, page: int) -> str:
         pass
     
     @abstractmethod
+    def _parse_listing_page(self, soup: BeautifulSoup, search_url: str) -> List[ListingCard]:
+        pass
+    
     def scrape_property_details(self, property_url: str) -> Optional[Property]:
+        try:
+            response = self.session.get(property_url, timeout=self.request_timeout)
+            response.raise_for_status()
+            
+            soup = BeautifulSoup(response.content, 'html.parser')
+            try:
+                return self._parse_property_details(soup, property_url)
+            finally:
+                soup.decompose()
+        except Exception as e:
+            logging.error(f"Error scraping {self.site_label} property details: {e}")
+            return None
+    
+    @abstractmethod
+    def _parse_property_details(self, soup: BeautifulSoup, property_url: str) -> Property:
         pass
     
+    def _accept_card(self, prop: ListingCard) -> bool:
+        if self.card_filter is None:
+            return True
+        # Stored listings always pass so they are marked seen; a stricter filter must not get them delisted
+        if self.is_known and self.is_known(prop.property_id):
+            return True
+        return self.card_filter.accept_card(prop)
+    
     def _extract_number(self, text: str) -> Optional[int]:
         if not text:
             return None
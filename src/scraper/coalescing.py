@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+class CoalescingSession:
+    def __init__(self, session_factory: Callable[[], requests.Session] = requests.Session, max_cached: int = 16):
+        self.session_factory = session_factory
+        self.headers = CaseInsensitiveDict()
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        # requests.Session is not thread-safe, so every shard thread gets its own connection pool
+        self._local = threading.local()
+        self._sessions = []
+        self.stats = {'fetched': 0, 'cache_hits': 0, 'coalesced': 0}
+    
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.session_factory()
+            session.headers.update(self.headers)
+            with self._lock:
+                self._sessions.append(session)
+        return session
+    
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+    
+    def begin_cycle(self):
+        with self._lock:
+            self._cache.clear()
+            self.stats = {'fetched': 0, 'cache_hits': 0, 'coalesced': 0}
+    
+    def end_cycle(self) -> dict:
+        with self._lock:
+            self._cache.clear()
+            stats = dict(self.stats)
+        # Shard threads are gone by now; drop their sessions rather than leak one pool per thread per cycle
+        self.close()
+        return stats
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        with self._lock:
+            if url in self._cache:
+                self._cache.move_to_end(url)
+                self.stats['cache_hits'] += 1
+                return self._cache[url]
+            
+            flight = self._inflight.get(url)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[url] = _Flight()
+            else:
+                self.stats['coalesced'] += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.response
+        
+        try:
+            flight.response = self.session.get(url, **kwargs)
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self.stats['fetched'] += 1
+                del self._inflight[url]
+                # Only successful pages are reused; errors are retried on the next request. Repeats arrive close
+                # together (overlapping shards, a card in two searches), so a few recent responses are enough
+                if flight.response is not None and flight.response.ok:
+                    self._cache[url] = flight.response
+                    while len(self._cache) > self.max_cached:
+                        self._cache.popitem(last=False)
+            flight.done.set()
\ No newline at end of file
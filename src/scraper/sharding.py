@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.listing_card import ListingCard
+
+PRICE_FROM_PARAM = 'price_from'
+PRICE_TO_PARAM = 'price_to'
+
+def price_bounds(url: str) -> Tuple[int, Optional[int]]:
+    query = dict(parse_qsl(urlsplit(url).query))
+    try:
+        low = int(float(query.get(PRICE_FROM_PARAM) or 0))
+        high = int(float(query[PRICE_TO_PARAM])) if query.get(PRICE_TO_PARAM) else None
+    except ValueError:
+        return 0, None
+    return low, high
+
+def with_price_range(url: str, low: int, high: int) -> str:
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key not in (PRICE_FROM_PARAM, PRICE_TO_PARAM)]
+    query += [(PRICE_FROM_PARAM, str(low)), (PRICE_TO_PARAM, str(high))]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+class PriceSharder:
+    def __init__(self, config: dict, max_workers: int = 3):
+        self.enabled = config.get('enabled', False)
+        self.min_band_width = config.get('min_band_width', 5000)
+        self.max_shards = config.get('max_shards', 16)
+        self.layout_ttl = config.get('layout_ttl_hours', 24) * 3600
+        self.max_workers = max(1, max_workers)
+        self.layouts: Dict[str, Tuple[float, List[Tuple[int, int]]]] = {}
+        self._lock = threading.Lock()
+    
+    def shard_urls(self, scraper, search_url: str, max_pages: int) -> List[str]:
+        if not self.enabled:
+            return [search_url]
+        
+        with self._lock:
+            planned_at, bands = self.layouts.get(search_url, (0, None))
+        if bands is None or time.time() - planned_at > self.layout_ttl:
+            bands = self._plan(scraper, search_url, max_pages)
+            with self._lock:
+                self.layouts[search_url] = (time.time(), bands)
+        
+        if not bands:
+            return [search_url]
+        return [with_price_range(search_url, low, high) for low, high in bands]
+    
+    def _plan(self, scraper, search_url: str, max_pages: int) -> List[Tuple[int, int]]:
+        low, high = price_bounds(search_url)
+        if high is None:
+            logging.warning(f"Search has no {PRICE_TO_PARAM} bound, crawling it unsharded: {search_url}")
+            return []
+        
+        pending = [(low, high)]
+        bands = []
+        while pending:
+            band_low, band_high = pending.pop()
+            can_split = band_high - band_low > self.min_band_width and len(bands) + len(pending) + 2 <= self.max_shards
+            if can_split and self._saturated(scraper, with_price_range(search_url, band_low, band_high), max_pages):
+                middle = (band_low + band_high) // 2
+                pending += [(middle + 1, band_high), (band_low, middle)]
+            else:
+                bands.append((band_low, band_high))
+        
+        bands.sort()
+        logging.info(f"Split search into {len(bands)} price bands: {search_url}")
+        return bands
+    
+    def _saturated(self, scraper, url: str, max_pages: int) -> bool:
+        # Listings past the page cap mean this band would be truncated
+        try:
+            return scraper.count_cards(url, max_pages + 1) > 0
+        except Exception as e:
+            logging.error(f"Error probing {scraper.site_label} price band {url}: {e}")
+            return False
+    
+    def scrape_listings(self, scraper, search_url: str, max_pages: int,
+                        on_page: Optional[Callable[[int, List[ListingCard]], None]] = None) -> List[ListingCard]:
+        urls = self.shard_urls(scraper, search_url, max_pages)
+        if len(urls) == 1:
+            return scraper.scrape_listings(urls[0], max_pages=max_pages, on_page=on_page)
+        
+        seen = set()
+        merged = []
+        truncated = []
+        merge_lock = threading.Lock()
+        
+        def crawl(url: str):
+            pages = []
+            
+            def collect(page: int, page_properties: List[ListingCard]):
+                pages.append(page)
+                with merge_lock:
+                    fresh = [prop for prop in page_properties if prop.property_id not in seen]
+                    seen.update(prop.property_id for prop in fresh)
+                    if on_page:
+                        if fresh:
+                            on_page(page, fresh)
+                    else:
+                        merged.extend(fresh)
+            
+            scraper.scrape_listings(url, max_pages=max_pages, on_page=collect)
+            if pages and pages[-1] >= max_pages:
+                truncated.append(url)
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            list(executor.map(crawl, urls))
+        
+        if truncated:
+            logging.info(f"{len(truncated)} price bands reached the page cap, re-planning next cycle: {search_url}")
+            with self._lock:
+                self.layouts.pop(search_url, None)
+        
+        return merged
\ No newline at end of file
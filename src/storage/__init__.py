@@ -1,4 +1,5 @@
 from .database import Database
 from .sheets_manager import SheetsManager
+from .sheet_reconciler import SheetReconciler
 
-__all__ = ['Database', 'SheetsManager'] 
\ No newline at end of file
+__all__ = ['Database', 'SheetsManager', 'SheetReconciler'] 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import sqlite3
 import json
-from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 import logging
 
@@ -9,6 +8,34 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.property import Property
+from models.listing_card import ListingCard
+from storage.rollups import apply_market_change, count_new_listing, count_seen_listings, summarize
+from utils.helpers import extract_district
+
+PROPERTY_FIELDS = (
+    'id', 'property_id', 'title', 'price', 'currency', 'location', 'district', 'size', 'rooms', 'bedrooms',
+    'floor', 'total_floors', 'property_type', 'description', 'images', 'source_url', 'detail_url',
+    'listing_date', 'scraped_at', 'last_seen', 'is_active', 'canonical_id', 'deal_score'
+)
+
+MARKET_COLUMNS = 'is_active, price, currency, district, size, rooms'
+
+# Order of Database._property_row; last_seen is filled in by SQLite
+ROW_COLUMNS = (
+    'property_id', 'title', 'price', 'currency', 'location', 'district', 'size', 'rooms', 'bedrooms',
+    'floor', 'total_floors', 'property_type', 'description', 'images', 'source_url', 'detail_url',
+    'listing_date', 'scraped_at', 'is_active', 'hash', 'canonical_id'
+)
+
+INSERT_PROPERTY = f'''
+    INSERT OR REPLACE INTO properties ({', '.join(ROW_COLUMNS)}, last_seen)
+    VALUES ({', '.join('?' * len(ROW_COLUMNS))}, CURRENT_TIMESTAMP)
+'''
+
+# Insert events carry the whole row as SQLite builds it, so the live feed and the backfill are identical
+CHANGE_PAYLOAD = 'json_object(' + ', '.join(
+    f"'{field}', {'CASE WHEN json_valid(images) THEN json(images) END' if field == 'images' else field}" for field in PROPERTY_FIELDS if field != 'id'
+) + ')'
 
 class Database:
     def __init__(self, db_path: str):
@@ -16,8 +43,18 @@ class Database:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
     
+    @classmethod
+    def open_readonly(cls, db_path: str) -> 'Database':
+        # For external readers: no schema setup, migrations or backfills, and a wrong path is an error, not a new file
+        if not Path(db_path).is_file():
+            raise FileNotFoundError(f"Database not found: {db_path}")
+        db = cls.__new__(cls)
+        db.db_path = db_path
+        return db
+    
     def _init_database(self):
         with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS properties (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -57,15 +94,222 @@ class Database:
                 )
             ''')
             
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sink_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sink TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    property_id TEXT NOT NULL,
+                    payload TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sink_dead_letters (
+                    id INTEGER PRIMARY KEY,
+                    sink TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    property_id TEXT NOT NULL,
+                    payload TEXT,
+                    attempts INTEGER,
+                    last_error TEXT,
+                    created_at DATETIME,
+                    dead_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sink_cursors (
+                    sink TEXT PRIMARY KEY,
+                    last_event_id INTEGER DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cycle_checkpoints (
+                    session_id INTEGER NOT NULL,
+                    search_key TEXT NOT NULL,
+                    last_page INTEGER DEFAULT 0,
+                    listing_done BOOLEAN DEFAULT FALSE,
+                    completed BOOLEAN DEFAULT FALSE,
+                    properties_found INTEGER DEFAULT 0,
+                    new_properties INTEGER DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (session_id, search_key)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS pending_listings (
+                    session_id INTEGER NOT NULL,
+                    property_id TEXT NOT NULL,
+                    search_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (session_id, search_key, property_id)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS listing_signatures (
+                    property_id TEXT PRIMARY KEY,
+                    canonical_id TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    price INTEGER,
+                    currency TEXT,
+                    size REAL,
+                    rooms INTEGER
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    bucket TEXT NOT NULL,
+                    property_id TEXT NOT NULL,
+                    PRIMARY KEY (bucket, property_id)
+                ) WITHOUT ROWID
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS image_hashes (
+                    property_id TEXT NOT NULL,
+                    image_url TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    phash TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (property_id, image_url)
+                )
+            ''')
+            
+            # Rollups maintained on every write so stats reads touch one row per group, not every listing
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS daily_counts (
+                    day DATE NOT NULL,
+                    site TEXT NOT NULL,
+                    search_key TEXT NOT NULL,
+                    new_listings INTEGER DEFAULT 0,
+                    seen_listings INTEGER DEFAULT 0,
+                    PRIMARY KEY (day, site, search_key)
+                ) WITHOUT ROWID
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS market_stats (
+                    district TEXT NOT NULL,
+                    rooms_bucket TEXT NOT NULL,
+                    currency TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    mean REAL DEFAULT 0,
+                    m2 REAL DEFAULT 0,
+                    histogram TEXT,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (district, rooms_bucket, currency)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Append-only feed for downstream consumers; AUTOINCREMENT keeps seq strictly increasing
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS change_log (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_type TEXT NOT NULL,
+                    property_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            self._add_missing_columns(conn, 'properties', {'canonical_id': 'TEXT', 'deal_score': 'REAL'})
+            self._add_missing_columns(conn, 'scraping_sessions', {
+                'stage_timings': 'TEXT', 'slow_functions': 'TEXT', 'peak_memory_mb': 'REAL'
+            })
+            
             conn.execute('''
                 CREATE INDEX IF NOT EXISTS idx_property_id ON properties(property_id)
             ''')
             
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_canonical_id ON properties(canonical_id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sink_outbox_sink ON sink_outbox(sink, id)
+            ''')
+            
             conn.execute('''
                 CREATE INDEX IF NOT EXISTS idx_last_seen ON properties(last_seen)
             ''')
             
+            # Read API: keyset pagination walks (scraped_at, id); filters either share that order or narrow by price
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_properties_scraped ON properties(scraped_at, id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_properties_rooms_scraped ON properties(rooms, scraped_at, id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_properties_price ON properties(currency, price)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_properties_deal_score ON properties(deal_score, id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sessions_started ON scraping_sessions(started_at)
+            ''')
+            
             conn.commit()
+            
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < 1:
+                # last_seen used to be written as local isoformat by inserts and as UTC by updates
+                conn.execute("UPDATE properties SET last_seen = datetime(last_seen, 'utc') WHERE last_seen LIKE '%T%'")
+                conn.execute('PRAGMA user_version = 1')
+                conn.commit()
+            
+            if version < 2:
+                # pending_listings was keyed per session only, so a listing from a second search was dropped
+                primary_key = [row[1] for row in conn.execute('PRAGMA table_info(pending_listings)') if row[5]]
+                if 'search_key' not in primary_key:
+                    conn.execute('ALTER TABLE pending_listings RENAME TO pending_listings_old')
+                    conn.execute('''
+                        CREATE TABLE pending_listings (
+                            session_id INTEGER NOT NULL,
+                            property_id TEXT NOT NULL,
+                            search_key TEXT NOT NULL,
+                            payload TEXT NOT NULL,
+                            PRIMARY KEY (session_id, search_key, property_id)
+                        )
+                    ''')
+                    conn.execute('''
+                        INSERT INTO pending_listings (session_id, property_id, search_key, payload)
+                        SELECT session_id, property_id, search_key, payload FROM pending_listings_old ORDER BY rowid
+                    ''')
+                    conn.execute('DROP TABLE pending_listings_old')
+                conn.execute('PRAGMA user_version = 2')
+                conn.commit()
+            
+            if conn.execute('SELECT 1 FROM change_log LIMIT 1').fetchone() is None:
+                self._backfill_change_log(conn)
+            
+            if version < 3:
+                # Rollups are built once for properties saved before they existed; later starts keep their history
+                if conn.execute('SELECT 1 FROM market_stats LIMIT 1').fetchone() is None and \
+                        conn.execute('SELECT 1 FROM properties LIMIT 1').fetchone() is not None:
+                    self._rebuild_rollups(conn)
+                conn.execute('PRAGMA user_version = 3')
+                conn.commit()
+    
+    def _add_missing_columns(self, conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for name, definition in columns.items():
+            if name not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
     
     def is_new_property(self, property_id: str) -> bool:
         with sqlite3.connect(self.db_path) as conn:
@@ -75,41 +319,374 @@ class Database:
             )
             return cursor.fetchone()[0] == 0
     
-    def save_property(self, property: Property) -> bool:
+    def _enqueue_sink_events(self, conn: sqlite3.Connection, sinks: List[str], event_type: str, property_id: str, payload: dict):
+        payload_json = json.dumps(payload, ensure_ascii=False)
+        conn.executemany(
+            'INSERT INTO sink_outbox (sink, event_type, property_id, payload) VALUES (?, ?, ?, ?)',
+            [(sink, event_type, property_id, payload_json) for sink in sinks]
+        )
+    
+    def _log_inserts(self, conn: sqlite3.Connection, where: str = '', params: tuple = ()):
+        conn.execute(f'''
+            INSERT INTO change_log (event_type, property_id, payload)
+            SELECT 'insert', property_id, {CHANGE_PAYLOAD} FROM properties {where} ORDER BY id
+        ''', params)
+    
+    def _log_change(self, conn: sqlite3.Connection, event_type: str, property_id: str, payload: dict):
+        conn.execute(
+            'INSERT INTO change_log (event_type, property_id, payload) VALUES (?, ?, ?)',
+            (event_type, property_id, json.dumps(payload, ensure_ascii=False))
+        )
+    
+    def _backfill_change_log(self, conn: sqlite3.Connection):
+        self._log_inserts(conn)
+        conn.execute('''
+            INSERT INTO change_log (event_type, property_id, payload)
+            SELECT 'delisted', property_id, json_object('last_seen', last_seen) FROM properties WHERE is_active = 0 ORDER BY id
+        ''')
+        conn.commit()
+    
+    def _rebuild_rollups(self, conn: sqlite3.Connection):
+        logging.info("Building market rollups from existing properties")
+        conn.row_factory = sqlite3.Row
+        conn.execute('DELETE FROM market_stats')
+        conn.execute('DELETE FROM daily_counts')
+        
+        for row in conn.execute('SELECT property_id, title, location, district FROM properties WHERE district IS NULL').fetchall():
+            district = extract_district(row['location'], row['title'])
+            if district:
+                conn.execute('UPDATE properties SET district = ? WHERE property_id = ?', (district, row['property_id']))
+        
+        for row in conn.execute(f'SELECT {MARKET_COLUMNS} FROM properties WHERE is_active = 1').fetchall():
+            apply_market_change(conn, row, 1)
+        
+        # Earlier days only know which site a listing came from, not which search found it
+        conn.execute('''
+            INSERT INTO daily_counts (day, site, search_key, new_listings)
+            SELECT DATE(scraped_at), substr(property_id, 1, instr(property_id, '_') - 1), '', COUNT(*)
+            FROM properties GROUP BY 1, 2
+        ''')
+        conn.commit()
+        conn.row_factory = None
+    
+    def rebuild_rollups(self):
+        with sqlite3.connect(self.db_path) as conn:
+            self._rebuild_rollups(conn)
+    
+    def _property_row(self, property: Property) -> tuple:
+        return (
+            property.property_id, property.title, property.price, property.currency,
+            property.location, property.district, property.size,
+            property.rooms, property.bedrooms, property.floor,
+            property.total_floors, property.property_type, property.description,
+            json.dumps(property.images), property.source_url, property.detail_url,
+            property.listing_date.isoformat() if property.listing_date else None, property.scraped_at.isoformat(),
+            True, property.generate_hash(), property.canonical_id
+        )
+    
+    def save_property(self, property: Property, sink_events: Optional[List[str]] = None, search_key: Optional[str] = None) -> bool:
         try:
-            data = property.to_dict()
-            data['hash'] = property.generate_hash()
-            
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT OR REPLACE INTO properties (
-                        property_id, title, price, currency, location, district,
-                        size, rooms, bedrooms, floor, total_floors, property_type,
-                        description, images, source_url, detail_url, listing_date,
-                        scraped_at, last_seen, is_active, hash
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['property_id'], data['title'], data['price'], data['currency'],
-                    data['location'], data.get('district'), data.get('size'),
-                    data.get('rooms'), data.get('bedrooms'), data.get('floor'),
-                    data.get('total_floors'), data['property_type'], data.get('description'),
-                    data['images'], data['source_url'], data.get('detail_url'),
-                    data.get('listing_date'), data['scraped_at'], data['scraped_at'],
-                    True, data['hash']
-                ))
+                conn.row_factory = sqlite3.Row
+                # Take the write lock before reading, so the rollup read-modify-write cannot interleave with another writer
+                conn.execute('BEGIN IMMEDIATE')
+                previous = conn.execute(
+                    f'SELECT {MARKET_COLUMNS} FROM properties WHERE property_id = ?', (property.property_id,)
+                ).fetchone()
+                if previous:
+                    apply_market_change(conn, previous, -1)
+                
+                row = self._property_row(property)
+                conn.execute(INSERT_PROPERTY, row)
+                apply_market_change(conn, {
+                    'is_active': True, 'price': property.price, 'currency': property.currency,
+                    'district': row[5], 'size': property.size, 'rooms': property.rooms
+                }, 1)
+                if previous is None:
+                    count_new_listing(conn, property.property_id, search_key)
+                    self._log_inserts(conn, 'WHERE property_id = ?', (property.property_id,))
+                elif previous['price'] != property.price:
+                    self._log_change(conn, 'price_change', property.property_id, {
+                        'old_price': previous['price'], 'price': property.price, 'currency': property.currency
+                    })
+                if sink_events:
+                    data = property.to_dict()
+                    data['hash'] = property.generate_hash()
+                    self._enqueue_sink_events(conn, sink_events, 'insert', property.property_id, data)
                 conn.commit()
             return True
         except Exception as e:
             logging.error(f"Error saving property {property.property_id}: {e}")
             return False
     
-    def update_property_last_seen(self, property_id: str):
+    def update_property_last_seen(self, property_id: str, price: Optional[int] = None, currency: Optional[str] = None,
+                                  sink_events: Optional[List[str]] = None) -> bool:
         with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(f'SELECT {MARKET_COLUMNS} FROM properties WHERE property_id = ?', (property_id,)).fetchone()
+            if row is None:
+                return False
+            
+            current = dict(row)
+            reactivated = not row['is_active']
+            if reactivated:
+                # Seen again after being marked delisted
+                current['is_active'] = 1
+                self._log_change(conn, 'relisted', property_id, {})
+                if sink_events:
+                    self._enqueue_sink_events(conn, sink_events, 'status', property_id, {'status': 'ACTIVE'})
+            
+            # A card quoted in another currency is not a price change
+            if price is not None and row['price'] != price and (currency is None or currency == row['currency']):
+                current['price'] = price
+                self._log_change(conn, 'price_change', property_id, {
+                    'old_price': row['price'], 'price': price, 'currency': row['currency']
+                })
+            
+            if current != dict(row):
+                apply_market_change(conn, row, -1)
+                apply_market_change(conn, current, 1)
             conn.execute(
-                'UPDATE properties SET last_seen = CURRENT_TIMESTAMP WHERE property_id = ?',
-                (property_id,)
+                'UPDATE properties SET last_seen = CURRENT_TIMESTAMP, is_active = 1, price = ? WHERE property_id = ?',
+                (current['price'], property_id)
+            )
+            conn.commit()
+            return reactivated
+    
+    def deactivate_stale_properties(self, max_age_hours: int, sink_events: Optional[List[str]] = None) -> List[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute(
+                f"SELECT property_id, last_seen, {MARKET_COLUMNS} FROM properties WHERE is_active = 1 AND last_seen < datetime('now', ?)",
+                (f'-{max_age_hours} hours',)
+            )
+            rows = cursor.fetchall()
+            property_ids = [row['property_id'] for row in rows]
+            for row in rows:
+                apply_market_change(conn, row, -1)
+            
+            conn.executemany(
+                'UPDATE properties SET is_active = 0 WHERE property_id = ?',
+                [(property_id,) for property_id in property_ids]
             )
+            for row in rows:
+                self._log_change(conn, 'delisted', row['property_id'], {'last_seen': row['last_seen']})
+            if sink_events:
+                for property_id in property_ids:
+                    self._enqueue_sink_events(conn, sink_events, 'status', property_id, {'status': 'DELISTED'})
             conn.commit()
+            return property_ids
+    
+    def get_market_samples(self) -> List[tuple]:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                'SELECT district, rooms, currency, price, size FROM properties WHERE is_active = 1 AND price > 0 AND size > 0'
+            )
+            return cursor.fetchall()
+    
+    def get_unscored_properties(self, after_id: int, limit: int) -> List[dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                f'SELECT id, property_id, {MARKET_COLUMNS} FROM properties WHERE id > ? AND deal_score IS NULL ORDER BY id LIMIT ?',
+                (after_id, limit)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_last_scored_id(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT COALESCE(MAX(id), 0) FROM properties WHERE deal_score IS NOT NULL').fetchone()[0]
+    
+    def save_deal_scores(self, scores: List[tuple], sink_events: Optional[List[str]] = None):
+        if not scores:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'UPDATE properties SET deal_score = ? WHERE property_id = ?',
+                [(score, property_id) for property_id, score in scores]
+            )
+            if sink_events:
+                for property_id, score in scores:
+                    self._enqueue_sink_events(conn, sink_events, 'score', property_id, {'deal_score': score})
+            conn.commit()
+    
+    def iter_changes(self, after_seq: int = 0, chunk_size: int = 1000, limit: Optional[int] = None) -> Iterator[List[dict]]:
+        remaining = limit
+        with self._connect_readonly() as conn:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                rows = conn.execute(
+                    'SELECT seq, event_type, property_id, created_at, payload FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?',
+                    (after_seq, size)
+                ).fetchall()
+                if not rows:
+                    return
+                after_seq = rows[-1]['seq']
+                if remaining is not None:
+                    remaining -= len(rows)
+                yield [dict(row) for row in rows]
+    
+    def get_change_head(self) -> int:
+        with self._connect_readonly() as conn:
+            return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log').fetchone()[0]
+    
+    def fetch_sink_events(self, sink: str, limit: int = 500) -> List[dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('''
+                SELECT * FROM sink_outbox
+                WHERE sink = ? AND id > COALESCE((SELECT last_event_id FROM sink_cursors WHERE sink = ?), 0)
+                ORDER BY id
+                LIMIT ?
+            ''', (sink, sink, limit))
+            events = [dict(row) for row in cursor.fetchall()]
+        
+        for event in events:
+            event['payload'] = json.loads(event['payload']) if event['payload'] else {}
+        return events
+    
+    def ack_sink_events(self, sink: str, last_event_id: int):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO sink_cursors (sink, last_event_id, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(sink) DO UPDATE SET last_event_id = excluded.last_event_id, updated_at = CURRENT_TIMESTAMP
+            ''', (sink, last_event_id))
+            conn.execute('DELETE FROM sink_outbox WHERE sink = ? AND id <= ?', (sink, last_event_id))
+            conn.commit()
+    
+    def record_sink_failure(self, sink: str, event_ids: List[int], error: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'UPDATE sink_outbox SET attempts = attempts + 1, last_error = ? WHERE sink = ? AND id = ?',
+                [(error, sink, event_id) for event_id in event_ids]
+            )
+            conn.commit()
+    
+    def reset_sink_attempts(self, sink: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('UPDATE sink_outbox SET attempts = 0 WHERE sink = ? AND attempts > 0', (sink,))
+            conn.commit()
+    
+    def dead_letter_sink_event(self, sink: str, event_id: int):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO sink_dead_letters (id, sink, event_type, property_id, payload, attempts, last_error, created_at)
+                SELECT id, sink, event_type, property_id, payload, attempts, last_error, created_at FROM sink_outbox WHERE sink = ? AND id = ?
+            ''', (sink, event_id))
+            conn.commit()
+        self.ack_sink_events(sink, event_id)
+    
+    def count_sink_events(self, sink: str) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                'SELECT COUNT(*) FROM sink_outbox WHERE sink = ? AND id > COALESCE((SELECT last_event_id FROM sink_cursors WHERE sink = ?), 0)',
+                (sink, sink)
+            )
+            return cursor.fetchone()[0]
+    
+    def iter_properties(self, chunk_size: int = 1000) -> Iterator[List[dict]]:
+        last_id = 0
+        while True:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute(
+                    'SELECT * FROM properties WHERE id > ? ORDER BY id LIMIT ?',
+                    (last_id, chunk_size)
+                )
+                rows = [dict(row) for row in cursor.fetchall()]
+            
+            if not rows:
+                return
+            
+            yield rows
+            last_id = rows[-1]['id']
+    
+    def get_duplicate_candidates(self, buckets: List[str], property_id: str, limit: int = 50) -> List[dict]:
+        if not buckets:
+            return []
+        
+        placeholders = ', '.join('?' * len(buckets))
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(f'''
+                SELECT s.* FROM listing_signatures s
+                JOIN (
+                    SELECT property_id, COUNT(*) AS shared FROM lsh_buckets
+                    WHERE bucket IN ({placeholders}) AND property_id != ?
+                    GROUP BY property_id
+                ) b ON b.property_id = s.property_id
+                ORDER BY b.shared DESC
+                LIMIT ?
+            ''', (*buckets, property_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def save_listing_signature(self, property: Property, signature: bytes, buckets: List[str]):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO listing_signatures (property_id, canonical_id, signature, price, currency, size, rooms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                property.property_id, property.canonical_id, signature,
+                property.price, property.currency, property.size, property.rooms
+            ))
+            conn.execute('DELETE FROM lsh_buckets WHERE property_id = ?', (property.property_id,))
+            conn.executemany(
+                'INSERT OR IGNORE INTO lsh_buckets (bucket, property_id) VALUES (?, ?)',
+                [(bucket, property.property_id) for bucket in buckets]
+            )
+            conn.commit()
+    
+    def get_canonical_id(self, property_id: str) -> Optional[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('SELECT canonical_id FROM properties WHERE property_id = ?', (property_id,)).fetchone()
+            return (row[0] or property_id) if row else None
+    
+    def save_image_hashes(self, property_id: str, images: List[tuple]):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO image_hashes (property_id, image_url, digest, phash) VALUES (?, ?, ?, ?)',
+                [(property_id, url, digest, phash) for url, digest, phash in images]
+            )
+            conn.commit()
+    
+    def iter_image_hashes(self) -> Iterator[tuple]:
+        with sqlite3.connect(self.db_path) as conn:
+            yield from conn.execute('SELECT property_id, phash FROM image_hashes')
+    
+    def get_property_images(self, property_id: str) -> List[dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('SELECT image_url, digest, phash FROM image_hashes WHERE property_id = ?', (property_id,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def set_canonical_id(self, property_id: str, canonical_id: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('UPDATE properties SET canonical_id = ? WHERE property_id = ?', (canonical_id, property_id))
+            # Later text matches inherit the canonical from the signature row
+            conn.execute('UPDATE listing_signatures SET canonical_id = ? WHERE property_id = ?', (canonical_id, property_id))
+            conn.commit()
+    
+    def iter_unsigned_properties(self, chunk_size: int = 500, after_id: int = 0) -> Iterator[List[dict]]:
+        last_id = after_id
+        while True:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute('''
+                    SELECT p.* FROM properties p
+                    LEFT JOIN listing_signatures s ON s.property_id = p.property_id
+                    WHERE p.id > ? AND s.property_id IS NULL
+                    ORDER BY p.id
+                    LIMIT ?
+                ''', (last_id, chunk_size))
+                rows = [dict(row) for row in cursor.fetchall()]
+            
+            if not rows:
+                return
+            
+            yield rows
+            last_id = rows[-1]['id']
     
     def get_recent_properties(self, limit: int = 50) -> List[dict]:
         with sqlite3.connect(self.db_path) as conn:
@@ -121,6 +698,65 @@ class Database:
             ''', (limit,))
             return [dict(row) for row in cursor.fetchall()]
     
+    def _connect_readonly(self) -> sqlite3.Connection:
+        # Read-only WAL readers never take the write lock, so API traffic cannot stall the scraper
+        conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def query_properties(self, fields: List[str], filters: dict, limit: int, after: Optional[tuple] = None,
+                         order: str = 'scraped_at') -> List[dict]:
+        unknown = set(fields) - set(PROPERTY_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if order not in ('scraped_at', 'deal_score'):
+            raise ValueError(f"Unknown order: {order}")
+        
+        columns = list(dict.fromkeys(list(fields) + [order, 'id']))
+        clauses = ['deal_score IS NOT NULL'] if order == 'deal_score' else []
+        params = []
+        if filters.get('site'):
+            # Unary + keeps the planner on the (order, id) index; a site covers too much of the table to sort
+            clauses.append('+property_id >= ? AND +property_id < ?')
+            params += [f"{filters['site']}_", f"{filters['site']}`"]
+        if filters.get('currency'):
+            clauses.append('currency = ?')
+            params.append(filters['currency'])
+        if filters.get('min_price') is not None:
+            clauses.append('price >= ?')
+            params.append(filters['min_price'])
+        if filters.get('max_price') is not None:
+            clauses.append('price <= ?')
+            params.append(filters['max_price'])
+        if filters.get('rooms') is not None:
+            clauses.append('rooms = ?')
+            params.append(filters['rooms'])
+        if filters.get('active') is not None:
+            clauses.append('is_active = ?')
+            params.append(bool(filters['active']))
+        if filters.get('since'):
+            clauses.append('scraped_at >= ?')
+            params.append(filters['since'])
+        if filters.get('canonical_id'):
+            clauses.append('canonical_id = ?')
+            params.append(filters['canonical_id'])
+        if after:
+            clauses.append(f'({order}, id) < (?, ?)')
+            params += list(after)
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._connect_readonly() as conn:
+            cursor = conn.execute(
+                f"SELECT {', '.join(columns)} FROM properties {where} ORDER BY {order} DESC, id DESC LIMIT ?",
+                params + [limit]
+            )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_property(self, property_id: str) -> Optional[dict]:
+        with self._connect_readonly() as conn:
+            row = conn.execute('SELECT * FROM properties WHERE property_id = ?', (property_id,)).fetchone()
+            return dict(row) if row else None
+    
     def start_scraping_session(self) -> int:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
@@ -129,32 +765,160 @@ class Database:
             conn.commit()
             return cursor.lastrowid
     
-    def finish_scraping_session(self, session_id: int, properties_found: int, new_properties: int, errors: str = None):
+    def finish_scraping_session(self, session_id: int, properties_found: int, new_properties: int, errors: str = None,
+                                stage_timings: Optional[Dict[str, float]] = None, slow_functions: Optional[List[dict]] = None,
+                                peak_memory_mb: Optional[float] = None):
         with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM cycle_checkpoints WHERE session_id = ?', (session_id,))
+            conn.execute('DELETE FROM pending_listings WHERE session_id = ?', (session_id,))
             conn.execute('''
                 UPDATE scraping_sessions 
                 SET completed_at = CURRENT_TIMESTAMP, 
                     properties_found = ?, 
                     new_properties = ?, 
                     errors = ?, 
+                    stage_timings = ?,
+                    slow_functions = ?,
+                    peak_memory_mb = ?,
                     status = "completed"
                 WHERE id = ?
-            ''', (properties_found, new_properties, errors, session_id))
+            ''', (properties_found, new_properties, errors, json.dumps(stage_timings) if stage_timings else None,
+                  json.dumps(slow_functions) if slow_functions else None, peak_memory_mb, session_id))
             conn.commit()
     
-    def get_stats(self) -> dict:
+    def get_orphaned_sessions(self) -> List[int]:
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM properties')
-            total_properties = cursor.fetchone()[0]
-            
-            cursor = conn.execute('SELECT COUNT(*) FROM properties WHERE DATE(scraped_at) = DATE("now")')
-            today_properties = cursor.fetchone()[0]
+            cursor = conn.execute('SELECT id FROM scraping_sessions WHERE status = "running" ORDER BY id')
+            return [row[0] for row in cursor.fetchall()]
+    
+    def abort_scraping_session(self, session_id: int, reason: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM cycle_checkpoints WHERE session_id = ?', (session_id,))
+            conn.execute('DELETE FROM pending_listings WHERE session_id = ?', (session_id,))
+            conn.execute('''
+                UPDATE scraping_sessions
+                SET completed_at = CURRENT_TIMESTAMP, errors = ?, status = "aborted"
+                WHERE id = ?
+            ''', (reason, session_id))
+            conn.commit()
+    
+    def plan_cycle(self, session_id: int, search_keys: List[str]):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO cycle_checkpoints (session_id, search_key) VALUES (?, ?)',
+                [(session_id, search_key) for search_key in search_keys]
+            )
+            conn.commit()
+    
+    def get_cycle_checkpoints(self, session_id: int) -> Dict[str, dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('SELECT * FROM cycle_checkpoints WHERE session_id = ?', (session_id,))
+            return {row['search_key']: dict(row) for row in cursor.fetchall()}
+    
+    def save_page_checkpoint(self, session_id: int, search_key: str, page: int, cards: List[ListingCard]):
+        with sqlite3.connect(self.db_path) as conn:
+            inserted = conn.executemany(
+                'INSERT OR IGNORE INTO pending_listings (session_id, property_id, search_key, payload) VALUES (?, ?, ?, ?)',
+                [
+                    (session_id, card.property_id, search_key, json.dumps(card.to_row(), ensure_ascii=False))
+                    for card in cards
+                ]
+            ).rowcount
+            conn.execute('''
+                UPDATE cycle_checkpoints
+                SET last_page = ?, properties_found = properties_found + ?, updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND search_key = ?
+            ''', (page, max(inserted, 0), session_id, search_key))
+            conn.commit()
+    
+    def mark_listing_done(self, session_id: int, search_key: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                UPDATE cycle_checkpoints SET listing_done = TRUE, updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND search_key = ?
+            ''', (session_id, search_key))
+            conn.commit()
+    
+    def get_pending_listings(self, session_id: int, search_key: str) -> List[ListingCard]:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                'SELECT payload FROM pending_listings WHERE session_id = ? AND search_key = ? ORDER BY rowid',
+                (session_id, search_key)
+            )
+            return [ListingCard.from_row(json.loads(row[0])) for row in cursor.fetchall()]
+    
+    def resolve_pending_listing(self, session_id: int, search_key: str, property_id: str, is_new: bool):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                'DELETE FROM pending_listings WHERE session_id = ? AND search_key = ? AND property_id = ?',
+                (session_id, search_key, property_id)
+            )
+            if is_new:
+                conn.execute(
+                    'UPDATE cycle_checkpoints SET new_properties = new_properties + 1 WHERE session_id = ? AND search_key = ?',
+                    (session_id, search_key)
+                )
+            conn.commit()
+    
+    def complete_search_checkpoint(self, session_id: int, search_key: str) -> dict:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                UPDATE cycle_checkpoints SET completed = TRUE, updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND search_key = ?
+            ''', (session_id, search_key))
+            cursor = conn.execute(
+                'SELECT properties_found, new_properties FROM cycle_checkpoints WHERE session_id = ? AND search_key = ?',
+                (session_id, search_key)
+            )
+            found, new = cursor.fetchone()
+            count_seen_listings(conn, search_key, found)
+            conn.commit()
+            return {'properties_found': found, 'new_properties': new}
+    
+    def record_seen_listings(self, search_key: str, seen: int):
+        with sqlite3.connect(self.db_path) as conn:
+            count_seen_listings(conn, search_key, seen)
+    
+    def get_stats(self) -> dict:
+        with self._connect_readonly() as conn:
+            # Properties are never deleted, so the daily insert counts add up to the table size
+            total_properties, today_properties, today_seen = conn.execute('''
+                SELECT COALESCE(SUM(new_listings), 0),
+                       COALESCE(SUM(CASE WHEN day = DATE('now') THEN new_listings END), 0),
+                       COALESCE(SUM(CASE WHEN day = DATE('now') THEN seen_listings END), 0)
+                FROM daily_counts
+            ''').fetchone()
             
-            cursor = conn.execute('SELECT COUNT(*) FROM scraping_sessions WHERE DATE(started_at) = DATE("now")')
+            cursor = conn.execute(
+                "SELECT COUNT(*) FROM scraping_sessions WHERE started_at >= DATE('now') AND started_at < DATE('now', '+1 day')"
+            )
             today_sessions = cursor.fetchone()[0]
             
             return {
                 'total_properties': total_properties,
                 'today_properties': today_properties,
+                'today_seen': today_seen,
                 'today_sessions': today_sessions
-            } 
\ No newline at end of file
+            }
+    
+    def get_daily_counts(self, days: int = 7) -> List[dict]:
+        with self._connect_readonly() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM daily_counts WHERE day >= DATE('now', ?) ORDER BY day DESC, site, search_key",
+                (f'-{days - 1} days',)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_market_stats(self, currency: Optional[str] = None, district: Optional[str] = None) -> List[dict]:
+        query = 'SELECT * FROM market_stats WHERE count > 0'
+        params = []
+        if currency:
+            query += ' AND currency = ?'
+            params.append(currency)
+        if district:
+            query += ' AND district = ?'
+            params.append(district)
+        with self._connect_readonly() as conn:
+            cursor = conn.execute(query + ' ORDER BY district, rooms_bucket, currency', params)
+            return [summarize(row) for row in cursor.fetchall()]
\ No newline at end of file
@@ -0,0 +1,112 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.database import Database
+from utils.metrics import RETRIES
+
+class SinkEventError(Exception):
+    # Raised by a sink when the data itself was refused, as opposed to the sink being unreachable
+    pass
+
+class OutboxWorker(threading.Thread):
+    def __init__(self, db: Database, sinks: Dict[str, object], config: dict = None):
+        super().__init__(name='homeus-outbox', daemon=True)
+        config = config or {}
+        self.db = db
+        self.sinks = sinks
+        self.batch_size = config.get('batch_size', 500)
+        self.poll_interval = config.get('poll_interval_seconds', 5)
+        self.retry_base = config.get('retry_base_seconds', 5)
+        self.retry_max = config.get('retry_max_seconds', 300)
+        self.max_attempts = config.get('max_attempts', 8)
+        self._failures = {name: 0 for name in sinks}
+        self._retry_at = {name: 0.0 for name in sinks}
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        logging.info(f"Outbox worker started for sinks: {', '.join(self.sinks)}")
+        while not self._stop_event.is_set():
+            try:
+                delivered = self.drain_once()
+            except Exception as e:
+                logging.error(f"Outbox worker error: {e}")
+                delivered = 0
+            
+            if not delivered:
+                self._stop_event.wait(self.poll_interval)
+    
+    def stop(self, timeout: float = 30):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+    
+    def drain_once(self) -> int:
+        delivered = 0
+        for name, sink in self.sinks.items():
+            if time.monotonic() < self._retry_at[name]:
+                continue
+            
+            events = self.db.fetch_sink_events(name, self.batch_size)
+            if not events:
+                continue
+            
+            # A batch that keeps failing is narrowed to its oldest event, so one bad event cannot hold back the rest
+            isolated = events[0]['attempts'] >= self.max_attempts
+            if isolated:
+                events = events[:1]
+            
+            rejected = False
+            try:
+                ok = sink.deliver(events)
+                error = None if ok else "sink unavailable"
+            except SinkEventError as e:
+                ok = False
+                rejected = True
+                error = str(e)
+            except Exception as e:
+                ok = False
+                error = str(e)
+            
+            if ok:
+                self.db.ack_sink_events(name, events[-1]['id'])
+                if self._failures[name] or isolated:
+                    self.db.reset_sink_attempts(name)
+                self._failures[name] = 0
+                delivered += len(events)
+                continue
+            
+            # Only an event the sink refused on its own is given up on; outages just back off
+            if isolated and rejected:
+                self.db.record_sink_failure(name, [events[0]['id']], error)
+                self.db.dead_letter_sink_event(name, events[0]['id'])
+                logging.error(f"Moved {events[0]['event_type']} event {events[0]['id']} for {events[0]['property_id']} "
+                              f"to sink_dead_letters after {events[0]['attempts'] + 1} failed deliveries to {name} ({error})")
+                continue
+            
+            self._failures[name] += 1
+            delay = min(self.retry_base * (2 ** (self._failures[name] - 1)), self.retry_max)
+            delay += random.uniform(0, delay / 10)
+            self._retry_at[name] = time.monotonic() + delay
+            self.db.record_sink_failure(name, [event['id'] for event in events], error)
+            logging.warning(f"Delivery of {len(events)} events to {name} failed ({error}), retrying in {delay:.0f}s")
+            RETRIES.inc(target=f"outbox_{name}")
+        
+        return delivered
+    
+    def drain(self, max_batches: int = 100) -> int:
+        delivered = 0
+        for _ in range(max_batches):
+            batch = self.drain_once()
+            if not batch:
+                break
+            delivered += batch
+        return delivered
+    
+    def backlog(self) -> Dict[str, int]:
+        return {name: self.db.count_sink_events(name) for name in self.sinks}
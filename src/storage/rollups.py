@@ -0,0 +1,102 @@
+import json
+import math
+import sqlite3
+from typing import List, Optional
+
+# Price per m² histogram: geometric buckets 5% wide from 50 up to ~75,000, enough for USD and GEL
+HISTOGRAM_LOW = 50.0
+HISTOGRAM_RATIO = 1.05
+HISTOGRAM_BUCKETS = 150
+
+def rooms_bucket(rooms: Optional[int]) -> str:
+    if not rooms:
+        return 'unknown'
+    return '5+' if rooms >= 5 else str(rooms)
+
+def bucket_index(value: float) -> int:
+    if value <= HISTOGRAM_LOW:
+        return 0
+    return min(HISTOGRAM_BUCKETS - 1, int(math.log(value / HISTOGRAM_LOW) / math.log(HISTOGRAM_RATIO)))
+
+def quantile(histogram: List[int], q: float) -> Optional[float]:
+    total = sum(histogram)
+    if not total:
+        return None
+    target = q * total
+    cumulative = 0
+    for index, count in enumerate(histogram):
+        if count and cumulative + count >= target:
+            # Interpolate geometrically inside the bucket
+            fraction = (target - cumulative) / count
+            return round(HISTOGRAM_LOW * HISTOGRAM_RATIO ** (index + fraction), 1)
+        cumulative += count
+    return round(HISTOGRAM_LOW * HISTOGRAM_RATIO ** HISTOGRAM_BUCKETS, 1)
+
+def market_key(row) -> Optional[tuple]:
+    if not row['is_active'] or not row['price'] or not row['size'] or row['size'] <= 0:
+        return None
+    return (row['district'] or 'other', rooms_bucket(row['rooms']), row['currency'] or 'USD')
+
+def apply_market_change(conn: sqlite3.Connection, row, sign: int):
+    key = market_key(row)
+    if key is None:
+        return
+    value = row['price'] / row['size']
+    
+    current = conn.execute(
+        'SELECT count, mean, m2, histogram FROM market_stats WHERE district = ? AND rooms_bucket = ? AND currency = ?',
+        key
+    ).fetchone()
+    count, mean, m2, histogram = current if current else (0, 0.0, 0.0, None)
+    histogram = json.loads(histogram) if histogram else [0] * HISTOGRAM_BUCKETS
+    
+    # Welford's update, run backwards when a listing leaves the group
+    if sign > 0:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    elif count <= 1:
+        count, mean, m2 = 0, 0.0, 0.0
+    else:
+        previous_mean = (count * mean - value) / (count - 1)
+        m2 = max(0.0, m2 - (value - previous_mean) * (value - mean))
+        mean = previous_mean
+        count -= 1
+    
+    index = bucket_index(value)
+    histogram[index] = max(0, histogram[index] + sign)
+    
+    conn.execute('''
+        INSERT OR REPLACE INTO market_stats (district, rooms_bucket, currency, count, mean, m2, histogram, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', key + (count, mean, m2, json.dumps(histogram)))
+
+def count_new_listing(conn: sqlite3.Connection, property_id: str, search_key: Optional[str]):
+    # Searches are keyed by the configured site name; listings saved outside a search fall back to the id prefix
+    site = search_key.split(':', 1)[0] if search_key else property_id.split('_', 1)[0]
+    conn.execute('''
+        INSERT INTO daily_counts (day, site, search_key, new_listings) VALUES (DATE('now'), ?, ?, 1)
+        ON CONFLICT (day, site, search_key) DO UPDATE SET new_listings = new_listings + 1
+    ''', (site, search_key or ''))
+
+def count_seen_listings(conn: sqlite3.Connection, search_key: str, seen: int):
+    conn.execute('''
+        INSERT INTO daily_counts (day, site, search_key, seen_listings) VALUES (DATE('now'), ?, ?, ?)
+        ON CONFLICT (day, site, search_key) DO UPDATE SET seen_listings = seen_listings + excluded.seen_listings
+    ''', (search_key.split(':', 1)[0], search_key, seen))
+
+def summarize(row) -> dict:
+    count = row['count']
+    histogram = json.loads(row['histogram']) if row['histogram'] else []
+    return {
+        'district': row['district'],
+        'rooms': row['rooms_bucket'],
+        'currency': row['currency'],
+        'count': count,
+        'mean_price_per_m2': round(row['mean'], 1) if count else None,
+        'stddev_price_per_m2': round(math.sqrt(row['m2'] / (count - 1)), 1) if count > 1 else None,
+        'p25_price_per_m2': quantile(histogram, 0.25),
+        'median_price_per_m2': quantile(histogram, 0.5),
+        'p75_price_per_m2': quantile(histogram, 0.75),
+    }
\ No newline at end of file
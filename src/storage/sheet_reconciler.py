@@ -0,0 +1,132 @@
+import hashlib
+import logging
+from typing import Dict, List, Tuple
+
+from gspread.utils import rowcol_to_a1
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.property import Property
+from storage.database import Database
+from storage.sheets_manager import SheetsManager, STATUS_COLUMN, SCORE_COLUMN
+
+DATA_COLUMNS = STATUS_COLUMN - 1
+
+def _normalize_cell(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def row_hash(row: list) -> str:
+    cells = [_normalize_cell(value) for value in row[:DATA_COLUMNS]]
+    cells += [''] * (DATA_COLUMNS - len(cells))
+    return hashlib.md5('\x1f'.join(cells).encode()).hexdigest()
+
+class SheetReconciler:
+    def __init__(self, db: Database, sheets: SheetsManager, chunk_size: int = 1000):
+        self.db = db
+        self.sheets = sheets
+        self.chunk_size = chunk_size
+    
+    def _read_sheet(self, dry_run: bool = False) -> Dict[str, Tuple[int, str, str, str]]:
+        values = self.sheets.read_all_values()
+        if not values or not values[0] or _normalize_cell(values[0][0]) != 'Property ID':
+            if any(any(_normalize_cell(cell) for cell in row) for row in values):
+                raise ValueError("Worksheet has no Homeus header row, refusing to reconcile into it")
+            if not dry_run:
+                self.sheets.setup_headers()
+            values = []
+        
+        sheet_rows = {}
+        for row_number, row in enumerate(values[1:], start=2):
+            if not row or not _normalize_cell(row[0]):
+                continue
+            status = _normalize_cell(row[STATUS_COLUMN - 1]) if len(row) >= STATUS_COLUMN else ''
+            score = _normalize_cell(row[SCORE_COLUMN - 1]) if len(row) >= SCORE_COLUMN else ''
+            sheet_rows[_normalize_cell(row[0])] = (row_number, row_hash(row), status, score)
+        
+        self.sheets.seed_row_index(
+            {property_id: entry[0] for property_id, entry in sheet_rows.items()},
+            len(values) + 1 if values else 2
+        )
+        return sheet_rows
+    
+    def run(self, dry_run: bool = False) -> dict:
+        sheet_rows = self._read_sheet(dry_run)
+        stats = {'inserted': 0, 'updated': 0, 'status_changed': 0, 'score_changed': 0, 'unchanged': 0, 'sheet_only': 0, 'errors': 0}
+        seen_ids = set()
+        updates: List[dict] = []
+        
+        for chunk in self.db.iter_properties(self.chunk_size):
+            for db_row in chunk:
+                property_id = db_row['property_id']
+                seen_ids.add(property_id)
+                
+                try:
+                    row = self.sheets.property_to_row(Property.from_db_row(db_row))
+                except Exception as e:
+                    logging.warning(f"Skipping property {property_id} during reconciliation: {e}")
+                    stats['errors'] += 1
+                    continue
+                
+                if not db_row['is_active']:
+                    row[STATUS_COLUMN - 1] = 'DELISTED'
+                
+                existing = sheet_rows.get(property_id)
+                if existing is None:
+                    if not dry_run:
+                        self.sheets.queue_row(row)
+                    stats['inserted'] += 1
+                    continue
+                
+                row_number, existing_hash, existing_status, existing_score = existing
+                changed = False
+                
+                if existing_hash != row_hash(row):
+                    updates.append({
+                        'range': f"{rowcol_to_a1(row_number, 1)}:{rowcol_to_a1(row_number, DATA_COLUMNS)}",
+                        'values': [row[:DATA_COLUMNS]]
+                    })
+                    stats['updated'] += 1
+                    changed = True
+                
+                # Active rows keep whatever status the sheet shows, unless it still says the listing is gone
+                status = None
+                if not db_row['is_active'] and existing_status != 'DELISTED':
+                    status = 'DELISTED'
+                elif db_row['is_active'] and existing_status == 'DELISTED':
+                    status = 'ACTIVE'
+                if status:
+                    updates.append({'range': rowcol_to_a1(row_number, STATUS_COLUMN), 'values': [[status]]})
+                    stats['status_changed'] += 1
+                    changed = True
+                
+                score = row[SCORE_COLUMN - 1]
+                if existing_score != _normalize_cell(score):
+                    updates.append({'range': rowcol_to_a1(row_number, SCORE_COLUMN), 'values': [[score]]})
+                    stats['score_changed'] += 1
+                    changed = True
+                
+                if not changed:
+                    stats['unchanged'] += 1
+            
+            if not dry_run:
+                self._flush(updates)
+        
+        if not dry_run:
+            self._flush(updates, force=True)
+        
+        stats['sheet_only'] = len(set(sheet_rows) - seen_ids)
+        logging.info(f"Google Sheets reconciliation finished: {stats}")
+        return stats
+    
+    def _flush(self, updates: List[dict], force: bool = False):
+        if updates and (force or len(updates) >= self.sheets.batch_size):
+            self.sheets.batch_update_values(updates)
+            updates.clear()
+        
+        pending = self.sheets.pending_row_count()
+        if pending and (force or pending >= self.sheets.batch_size):
+            if not self.sheets.flush_rows():
+                raise RuntimeError("Failed to append new rows to Google Sheets")
@@ -1,20 +1,44 @@
 import gspread
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
 from google.auth.exceptions import GoogleAuthError
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import json
+import random
+import time
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.property import Property
+from utils.metrics import RETRIES, timed
+from utils.rate_limiter import RateLimiter
+from storage.outbox import SinkEventError
+
+STATUS_COLUMN = 19
+SCORE_COLUMN = 20
+
+def _rejects_payload(error: Optional[Exception]) -> bool:
+    # A 400 means the request itself was refused; auth, quota and server errors say nothing about the data
+    response = getattr(error, 'response', None)
+    return isinstance(error, gspread.exceptions.APIError) and getattr(response, 'status_code', None) == 400
 
 class SheetsManager:
     def __init__(self, config: dict):
         self.config = config
         self.client = None
         self.worksheet = None
+        self.batch_size = config.get('batch_size', 500)
+        self.max_retries = config.get('max_retries', 5)
+        self.backoff_base = config.get('backoff_base_seconds', 2)
+        self.limiter = RateLimiter(config.get('write_requests_per_minute', 60), 60)
+        self._pending_rows = []
+        self._pending_status = {}
+        self._pending_scores = {}
+        self._row_index = None
+        self._next_row = 2
+        self.last_error = None
         self._init_sheets()
     
     def _init_sheets(self):
@@ -38,7 +62,7 @@ class SheetsManager:
                     rows=1000,
                     cols=20
                 )
-                self._setup_headers()
+                self.setup_headers()
             
             logging.info("Google Sheets integration initialized successfully")
             
@@ -47,7 +71,13 @@ class SheetsManager:
         except Exception as e:
             logging.error(f"Google Sheets initialization failed: {e}")
     
-    def _setup_headers(self):
+    def _ensure_worksheet(self) -> bool:
+        if self.worksheet is None and self.config.get('enabled', False):
+            # Startup may have hit a transient error; retry instead of treating the sheet as gone for good
+            self._init_sheets()
+        return self.worksheet is not None
+    
+    def setup_headers(self):
         if not self.worksheet:
             return
         
@@ -55,13 +85,15 @@ class SheetsManager:
             'Property ID', 'Title', 'Price', 'Currency', 'Location', 'District',
             'Size (m²)', 'Rooms', 'Bedrooms', 'Floor', 'Total Floors',
             'Property Type', 'Description', 'Images Count', 'Source URL',
-            'Detail URL', 'Listing Date', 'Scraped At', 'Status'
+            'Detail URL', 'Listing Date', 'Scraped At', 'Status', 'Deal Score'
         ]
         
         try:
             self.worksheet.clear()
-            self.worksheet.update('A1:S1', [headers])
-            self.worksheet.format('A1:S1', {
+            self._row_index = {}
+            self._next_row = 2
+            self.worksheet.update('A1:T1', [headers])
+            self.worksheet.format('A1:T1', {
                 'textFormat': {'bold': True},
                 'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
             })
@@ -69,34 +101,61 @@ class SheetsManager:
         except Exception as e:
             logging.error(f"Error setting up Google Sheets headers: {e}")
     
+    def property_to_row(self, property: Property) -> list:
+        return [
+            property.property_id,
+            property.title,
+            property.price or '',
+            property.currency,
+            property.location,
+            property.district or '',
+            f"{property.size} m²" if property.size else '',
+            property.rooms or '',
+            property.bedrooms or '',
+            property.floor or '',
+            property.total_floors or '',
+            property.property_type,
+            (property.description[:100] + '...') if property.description and len(property.description) > 100 else (property.description or ''),
+            len(property.images),
+            property.source_url,
+            property.detail_url or '',
+            property.listing_date.strftime('%Y-%m-%d %H:%M:%S') if property.listing_date else '',
+            property.scraped_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'NEW',
+            property.deal_score if property.deal_score is not None else ''
+        ]
+    
+    def _call_with_backoff(self, func, *args, **kwargs):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                with timed('google', 'sheets'):
+                    return func(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                response = getattr(e, 'response', None)
+                status_code = getattr(response, 'status_code', None)
+                if status_code != 429 and (status_code is None or status_code < 500):
+                    raise
+                if attempt >= self.max_retries:
+                    raise
+                
+                delay = min(self.backoff_base * (2 ** attempt), 64) + random.uniform(0, 1)
+                if status_code == 429:
+                    self.limiter.block_for(delay)
+                logging.warning(f"Google Sheets returned {status_code}, retrying in {delay:.1f}s")
+                RETRIES.inc(target='sheets')
+                time.sleep(delay)
+                attempt += 1
+    
     def add_property(self, property: Property) -> bool:
         if not self.worksheet:
             return False
         
         try:
-            row_data = [
-                property.property_id,
-                property.title,
-                property.price or '',
-                property.currency,
-                property.location,
-                property.district or '',
-                f"{property.size} m²" if property.size else '',
-                property.rooms or '',
-                property.bedrooms or '',
-                property.floor or '',
-                property.total_floors or '',
-                property.property_type,
-                (property.description[:100] + '...') if property.description and len(property.description) > 100 else (property.description or ''),
-                len(property.images),
-                property.source_url,
-                property.detail_url or '',
-                property.listing_date.strftime('%Y-%m-%d %H:%M:%S') if property.listing_date else '',
-                property.scraped_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'NEW'
-            ]
-            
-            self.worksheet.append_row(row_data)
+            row = self.property_to_row(property)
+            response = self._call_with_backoff(self.worksheet.append_row, row)
+            self._index_appended_rows([row], response)
             logging.info(f"Added property to Google Sheets: {property.property_id}")
             return True
             
@@ -104,58 +163,188 @@ class SheetsManager:
             logging.error(f"Error adding property to Google Sheets: {e}")
             return False
     
+    def queue_property(self, property: Property):
+        if not self.worksheet:
+            return
+        self._pending_rows.append(self.property_to_row(property))
+    
+    def queue_row(self, row: list):
+        if not self.worksheet:
+            return
+        self._pending_rows.append(row)
+    
+    def pending_row_count(self) -> int:
+        return len(self._pending_rows)
+    
+    def pending_count(self) -> int:
+        return len(self._pending_rows) + len(self._pending_status) + len(self._pending_scores)
+    
+    def flush(self) -> bool:
+        if not self._ensure_worksheet():
+            return True
+        return self.flush_rows() and self.flush_status_updates()
+    
+    def flush_rows(self) -> bool:
+        if not self._pending_rows:
+            return True
+        
+        flushed = 0
+        try:
+            while self._pending_rows:
+                chunk = self._pending_rows[:self.batch_size]
+                response = self._call_with_backoff(self.worksheet.append_rows, chunk)
+                self._index_appended_rows(chunk, response)
+                del self._pending_rows[:len(chunk)]
+                flushed += len(chunk)
+            
+            logging.info(f"Added {flushed} properties to Google Sheets")
+            return True
+            
+        except Exception as e:
+            self.last_error = e
+            logging.error(f"Error flushing properties to Google Sheets ({flushed} written, {len(self._pending_rows)} still pending): {e}")
+            return False
+    
     def add_properties_batch(self, properties: List[Property]) -> bool:
         if not self.worksheet or not properties:
             return False
         
+        for property in properties:
+            self.queue_property(property)
+        return self.flush()
+    
+    def _load_row_index(self):
+        property_ids = self._call_with_backoff(self.worksheet.col_values, 1)
+        self._row_index = {
+            property_id: row
+            for row, property_id in enumerate(property_ids, start=1)
+            if row > 1 and property_id
+        }
+        self._next_row = len(property_ids) + 1
+    
+    def _ensure_row_index(self):
+        if self._row_index is None:
+            self._load_row_index()
+    
+    def _index_appended_rows(self, rows: list, response):
+        if self._row_index is None:
+            return
+        
+        start_row = self._next_row
+        updated_range = None
+        if isinstance(response, dict):
+            updated_range = response.get('updates', {}).get('updatedRange')
+        if updated_range:
+            start_row = a1_to_rowcol(updated_range.split('!')[-1].split(':')[0])[0]
+        
+        for offset, row in enumerate(rows):
+            self._row_index[row[0]] = start_row + offset
+        self._next_row = max(self._next_row, start_row + len(rows))
+    
+    def seed_row_index(self, row_index: Dict[str, int], next_row: int):
+        # Callers that already read the whole sheet save the extra column read
+        self._row_index = dict(row_index)
+        self._next_row = next_row
+    
+    def get_row(self, property_id: str) -> Optional[int]:
+        if not self.worksheet:
+            return None
+        self._ensure_row_index()
+        return self._row_index.get(property_id)
+    
+    def update_property_status(self, property_id: str, status: str) -> bool:
+        if not self.worksheet:
+            return False
+        
+        self._pending_status[property_id] = status
+        return True
+    
+    def update_property_score(self, property_id: str, deal_score: float) -> bool:
+        if not self.worksheet:
+            return False
+        
+        self._pending_scores[property_id] = deal_score
+        return True
+    
+    def flush_status_updates(self) -> bool:
+        if not self.worksheet or not (self._pending_status or self._pending_scores):
+            return True
+        
         try:
-            rows_data = []
-            for property in properties:
-                row_data = [
-                    property.property_id,
-                    property.title,
-                    property.price or '',
-                    property.currency,
-                    property.location,
-                    property.district or '',
-                    f"{property.size} m²" if property.size else '',
-                    property.rooms or '',
-                    property.bedrooms or '',
-                    property.floor or '',
-                    property.total_floors or '',
-                    property.property_type,
-                    (property.description[:100] + '...') if property.description and len(property.description) > 100 else (property.description or ''),
-                    len(property.images),
-                    property.source_url,
-                    property.detail_url or '',
-                    property.listing_date.strftime('%Y-%m-%d %H:%M:%S') if property.listing_date else '',
-                    property.scraped_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'NEW'
-                ]
-                rows_data.append(row_data)
+            self._ensure_row_index()
+            
+            updates = []
+            for column, pending in ((STATUS_COLUMN, self._pending_status), (SCORE_COLUMN, self._pending_scores)):
+                for property_id, value in pending.items():
+                    row = self._row_index.get(property_id)
+                    if row is None:
+                        logging.warning(f"Property {property_id} not found in Google Sheets, skipping update")
+                        continue
+                    updates.append({'range': rowcol_to_a1(row, column), 'values': [[value]]})
             
-            self.worksheet.append_rows(rows_data)
-            logging.info(f"Added {len(properties)} properties to Google Sheets")
+            if updates:
+                self._call_with_backoff(self.worksheet.batch_update, updates)
+                logging.info(f"Updated {len(updates)} status and score cells in Google Sheets")
+            
+            self._pending_status.clear()
+            self._pending_scores.clear()
             return True
             
         except Exception as e:
-            logging.error(f"Error adding properties batch to Google Sheets: {e}")
+            self.last_error = e
+            logging.error(f"Error updating property statuses in Google Sheets: {e}")
             return False
     
-    def update_property_status(self, property_id: str, status: str) -> bool:
-        if not self.worksheet:
+    def deliver(self, events: List[dict]) -> bool:
+        if not self._ensure_worksheet():
             return False
         
+        self._pending_rows.clear()
+        self._pending_status.clear()
+        self._pending_scores.clear()
+        
         try:
-            cell = self.worksheet.find(property_id)
-            if cell:
-                self.worksheet.update_cell(cell.row, 19, status)  # Status column
-                return True
+            self._ensure_row_index()
         except Exception as e:
-            logging.error(f"Error updating property status in Google Sheets: {e}")
+            logging.error(f"Error reading Google Sheets row index: {e}")
+            return False
+        
+        queued_ids = set()
+        for event in events:
+            property_id = event['property_id']
+            try:
+                if event['event_type'] == 'insert':
+                    if property_id in self._row_index or property_id in queued_ids:
+                        continue
+                    self.queue_property(Property.from_db_row(event['payload']))
+                    queued_ids.add(property_id)
+                elif event['event_type'] == 'status':
+                    self.update_property_status(property_id, event['payload']['status'])
+                elif event['event_type'] == 'score':
+                    self.update_property_score(property_id, event['payload']['deal_score'])
+            except Exception as e:
+                logging.error(f"Dropping malformed Google Sheets event {event['id']} for {property_id}: {e}")
         
+        self.last_error = None
+        if self.flush():
+            return True
+        
+        # A failed append may still have landed, so re-read the sheet before retrying
+        self._pending_rows.clear()
+        self._pending_status.clear()
+        self._pending_scores.clear()
+        self._row_index = None
+        if _rejects_payload(self.last_error):
+            raise SinkEventError(str(self.last_error))
         return False
     
+    def read_all_values(self) -> List[list]:
+        return self._call_with_backoff(self.worksheet.get_all_values, value_render_option='UNFORMATTED_VALUE')
+    
+    def batch_update_values(self, updates: List[dict]):
+        for start in range(0, len(updates), self.batch_size):
+            self._call_with_backoff(self.worksheet.batch_update, updates[start:start + self.batch_size])
+    
     def get_sheet_url(self) -> Optional[str]:
         if not self.config.get('sheet_id'):
             return None
@@ -0,0 +1,173 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class WorkQueue:
+    def __init__(self, db_path: str, visibility_timeout: float = 300, max_attempts: int = 3):
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_tables()
+    
+    @contextmanager
+    def _transaction(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+    
+    def _init_tables(self):
+        with self._transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS work_tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cycle_id INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    dedupe_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    visible_at REAL DEFAULT 0,
+                    result TEXT,
+                    last_error TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # A key can only be queued once while it is pending or leased, so overlapping pages never fan out duplicate work
+            conn.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_work_tasks_active_key
+                ON work_tasks(dedupe_key) WHERE status IN ('pending', 'leased')
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_work_tasks_claim ON work_tasks(status, visible_at)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_work_tasks_cycle ON work_tasks(cycle_id, status)
+            ''')
+    
+    def enqueue(self, cycle_id: int, kind: str, payload: dict, dedupe_key: str, delay: float = 0) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute('''
+                INSERT OR IGNORE INTO work_tasks (cycle_id, kind, dedupe_key, payload, visible_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (cycle_id, kind, dedupe_key, json.dumps(payload, ensure_ascii=False), time.time() + delay))
+            return cursor.rowcount == 1
+    
+    def claim(self, owner: str, limit: int = 1) -> List[dict]:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute('''
+                UPDATE work_tasks
+                SET status = 'failed', last_error = 'lease expired too many times', lease_owner = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'leased' AND lease_expires_at <= ? AND attempts >= ?
+            ''', (now, self.max_attempts))
+            
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute('''
+                SELECT * FROM work_tasks
+                WHERE (status = 'pending' AND visible_at <= ?) OR (status = 'leased' AND lease_expires_at <= ?)
+                ORDER BY CASE kind WHEN 'detail' THEN 0 ELSE 1 END, id
+                LIMIT ?
+            ''', (now, now, limit)).fetchall()
+            
+            conn.executemany('''
+                UPDATE work_tasks
+                SET status = 'leased', lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', [(owner, now + self.visibility_timeout, row['id']) for row in rows])
+        
+        tasks = []
+        for row in rows:
+            task = dict(row)
+            task['payload'] = json.loads(task['payload'])
+            task['attempts'] += 1
+            tasks.append(task)
+        return tasks
+    
+    def heartbeat(self, task_id: int, owner: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE work_tasks SET lease_expires_at = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            ''', (time.time() + self.visibility_timeout, task_id, owner))
+            return cursor.rowcount == 1
+    
+    def complete(self, task_id: int, owner: str, result: Optional[dict] = None) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE work_tasks
+                SET status = 'done', result = ?, lease_owner = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            ''', (json.dumps(result or {}), task_id, owner))
+            return cursor.rowcount == 1
+    
+    def fail(self, task_id: int, owner: str, error: str, retry_delay: float = 30) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE work_tasks
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    visible_at = ?, last_error = ?, lease_owner = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            ''', (self.max_attempts, time.time() + retry_delay, error, task_id, owner))
+            return cursor.rowcount == 1
+    
+    def cycle_counts(self, cycle_id: int) -> Dict[str, int]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT status, COUNT(*) FROM work_tasks WHERE cycle_id = ? GROUP BY status',
+                (cycle_id,)
+            ).fetchall()
+        return dict(rows)
+    
+    def cycle_results(self, cycle_id: int) -> Dict[str, Dict[str, int]]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT json_extract(payload, '$.search_key'), result FROM work_tasks WHERE cycle_id = ? AND status = 'done'",
+                (cycle_id,)
+            ).fetchall()
+        
+        totals = {}
+        for search_key, result in rows:
+            search_totals = totals.setdefault(search_key, {})
+            for key, value in json.loads(result or '{}').items():
+                search_totals[key] = search_totals.get(key, 0) + value
+        return totals
+    
+    def open_cycle_ids(self) -> List[int]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT cycle_id FROM work_tasks WHERE status IN ('pending', 'leased') ORDER BY cycle_id"
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def depth(self) -> Dict[str, int]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT kind, COUNT(*) FROM work_tasks WHERE status IN ('pending', 'leased') GROUP BY kind"
+            ).fetchall()
+        return dict(rows)
+    
+    def purge_finished(self, older_than_hours: int = 24):
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM work_tasks WHERE status IN ('done', 'failed') AND updated_at < datetime('now', ?)",
+                (f'-{older_than_hours} hours',)
+            )
\ No newline at end of file
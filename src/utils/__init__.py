@@ -1,5 +1,6 @@
 from .logger import setup_logger
-from .config import load_config
+from .config import load_config, validate_config, ConfigWatcher
+from .rate_limiter import RateLimiter
 from .helpers import *
 
-__all__ = ['setup_logger', 'load_config'] 
\ No newline at end of file
+__all__ = ['setup_logger', 'load_config', 'validate_config', 'ConfigWatcher', 'RateLimiter'] 
\ No newline at end of file
@@ -1,9 +1,13 @@
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import os
 from dotenv import load_dotenv
 
+from .helpers import is_valid_url
+
+REQUIRED_SECTIONS = ['scraping', 'websites', 'database', 'google_sheets', 'logging']
+
 def load_config(config_path: str) -> Dict[str, Any]:
     load_dotenv()
     
@@ -30,4 +34,97 @@ def _substitute_env_vars(obj):
             env_var, default_value = env_var.split(':', 1)
         return os.getenv(env_var, default_value)
     else:
-        return obj 
\ No newline at end of file
+        return obj 
+
+def validate_config(config: Dict[str, Any]):
+    errors = []
+    
+    if not isinstance(config, dict):
+        raise ValueError("Invalid configuration: top level must be a mapping")
+    
+    for section in REQUIRED_SECTIONS:
+        if not isinstance(config.get(section), dict):
+            errors.append(f"missing section '{section}'")
+    
+    scraping = config.get('scraping') or {}
+    if not _is_positive_number(scraping.get('interval_minutes')):
+        errors.append("scraping.interval_minutes must be a positive number")
+    if 'max_pages' in scraping and not (isinstance(scraping['max_pages'], int) and scraping['max_pages'] > 0):
+        errors.append("scraping.max_pages must be a positive integer")
+    
+    for site_name, site_config in (config.get('websites') or {}).items():
+        errors.extend(_validate_site(site_name, site_config))
+    
+    filters = config.get('filters') or {}
+    for key in ('min_price', 'max_price', 'min_size', 'max_size'):
+        if filters.get(key) is not None and not isinstance(filters[key], (int, float)):
+            errors.append(f"filters.{key} must be a number")
+    for key in ('excluded_keywords', 'required_keywords'):
+        if filters.get(key) is not None and not isinstance(filters[key], list):
+            errors.append(f"filters.{key} must be a list")
+    
+    sheets = config.get('google_sheets') or {}
+    if sheets.get('enabled') and not sheets.get('sheet_id'):
+        errors.append("google_sheets.sheet_id is required when Google Sheets is enabled")
+    
+    dedup = config.get('dedup') or {}
+    if dedup.get('enabled') and dedup.get('num_perm', 64) % dedup.get('bands', 16):
+        errors.append("dedup.num_perm must be divisible by dedup.bands")
+    
+    notifications = config.get('notifications') or {}
+    for index, rule in enumerate(notifications.get('rules') or []):
+        if not isinstance(rule, dict) or not rule.get('name'):
+            errors.append(f"notifications.rules[{index}] needs a name")
+            continue
+        for key in ('min_price', 'max_price', 'min_size', 'max_size'):
+            value = rule.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                errors.append(f"notifications.rules[{index}].{key} must be a number")
+    
+    if errors:
+        raise ValueError("Invalid configuration: " + "; ".join(errors))
+
+def _validate_site(site_name: str, site_config) -> List[str]:
+    if not isinstance(site_config, dict):
+        return [f"websites.{site_name} must be a mapping"]
+    
+    errors = []
+    if not site_config.get('base_url'):
+        errors.append(f"websites.{site_name}.base_url is required")
+    
+    search_urls = site_config.get('search_urls')
+    if not isinstance(search_urls, list) or not search_urls:
+        errors.append(f"websites.{site_name}.search_urls must be a non-empty list")
+        return errors
+    
+    for index, search in enumerate(search_urls):
+        if not isinstance(search, dict) or not search.get('name'):
+            errors.append(f"websites.{site_name}.search_urls[{index}] needs a name")
+        elif not search.get('url') or not is_valid_url(search['url']):
+            errors.append(f"websites.{site_name}.search_urls[{index}] has an invalid url")
+    return errors
+
+def _is_positive_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+class ConfigWatcher:
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._signature = self._stat()
+    
+    def _stat(self):
+        try:
+            stat = Path(self.config_path).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def poll(self) -> Optional[Dict[str, Any]]:
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        
+        self._signature = signature
+        config = load_config(self.config_path)
+        validate_config(config)
+        return config
@@ -1,4 +1,5 @@
 import re
+import unicodedata
 from typing import Optional, List
 from datetime import datetime
 import hashlib
@@ -20,6 +21,12 @@ def clean_text(text: str) -> str:
         return ""
     return ' '.join(text.strip().split())
 
+def normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return ' '.join(re.sub(r'[^\w]+', ' ', text).split())
+
 def normalize_currency(price_text: str) -> tuple[Optional[int], str]:
     if not price_text:
         return None, "USD"
@@ -73,4 +80,38 @@ def extract_size_sqm(text: str) -> Optional[float]:
     if not text:
         return None
     match = re.search(r'(\d+(?:\.\d+)?)\s*(?:მ²|კვ\.მ|კვადრატული)', text)
-    return float(match.group(1)) if match else None 
\ No newline at end of file
+    return float(match.group(1)) if match else None 
+
+# Tbilisi districts as they appear in listing locations and titles, in Georgian and transliterated
+DISTRICTS = {
+    'Vake': ('ვაკე', 'vake'),
+    'Saburtalo': ('საბურთალო', 'saburtalo'),
+    'Vere': ('ვერე', 'vere'),
+    'Mtatsminda': ('მთაწმინდა', 'mtatsminda', 'sololaki', 'სოლოლაკი'),
+    'Krtsanisi': ('კრწანისი', 'krtsanisi', 'ortachala', 'ორთაჭალა'),
+    'Chugureti': ('ჩუღურეთი', 'chugureti'),
+    'Didube': ('დიდუბე', 'didube'),
+    'Nadzaladevi': ('ნაძალადევი', 'nadzaladevi'),
+    'Gldani': ('გლდანი', 'gldani'),
+    'Isani': ('ისანი', 'isani'),
+    'Samgori': ('სამგორი', 'samgori', 'ვარკეთილი', 'varketili'),
+    'Didi Dighomi': ('დიდი დიღომი', 'didi dighomi'),
+    'Dighomi': ('დიღომი', 'dighomi'),
+}
+
+_DISTRICT_NAMES = sorted(
+    ((name, district) for district, names in DISTRICTS.items() for name in names),
+    key=lambda item: len(item[0]), reverse=True
+)
+
+def extract_district(*texts: Optional[str]) -> Optional[str]:
+    for text in texts:
+        normalized = normalize_text(text)
+        if not normalized:
+            continue
+        # Names match at a word start (Georgian adds case suffixes); longest first so "Didi Dighomi" beats "Dighomi"
+        normalized = ' ' + normalized
+        for name, district in _DISTRICT_NAMES:
+            if ' ' + name in normalized:
+                return district
+    return None
\ No newline at end of file
@@ -1,35 +1,154 @@
+import atexit
+import contextvars
+import json
 import logging
 import logging.handlers
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+_context = contextvars.ContextVar('homeus_log_context', default={})
+_listener: Optional[logging.handlers.QueueListener] = None
+_front_handlers: List[logging.Handler] = []
+
+@contextmanager
+def log_context(**fields):
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _context.get()
+        return True
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, per_minute: int):
+        super().__init__()
+        self.per_minute = per_minute
+        self._windows = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # One instance is shared by every handler, so each record is only counted once
+        if hasattr(record, 'rate_limited'):
+            return not record.rate_limited
+        # Only warnings are limited: info lines report every new listing and errors must always surface
+        record.rate_limited = record.levelno == logging.WARNING and not self._allow(record)
+        return not record.rate_limited
+    
+    def _allow(self, record: logging.LogRecord) -> bool:
+        # Messages are f-strings, so repeats are recognised by their call site rather than their text
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= 60:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [record.created, 1, 0]
+            elif window[1] < self.per_minute:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        context = getattr(record, 'context', None)
+        if context:
+            text += ' [' + ' '.join(f"{key}={value}" for key, value in context.items()) + ']'
+        return text
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def stop_logging():
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
 
 def setup_logger(config: Dict[str, Any]) -> logging.Logger:
-    logger = logging.getLogger('homeus')
-    logger.setLevel(getattr(logging, config.get('level', 'INFO')))
+    global _listener
+    stop_logging()
+    
+    root = logging.getLogger()
+    for handler in _front_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _front_handlers.clear()
     
+    # Library modules log through the root logger, so the handlers live there and 'homeus' just propagates
+    level = getattr(logging, config.get('level', 'INFO'))
+    root.setLevel(level)
+    logger = logging.getLogger('homeus')
+    logger.setLevel(level)
     if logger.handlers:
         logger.handlers.clear()
     
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if config.get('format', 'text') == 'json':
+        formatter = JsonFormatter(datefmt='%Y-%m-%dT%H:%M:%S')
+    else:
+        formatter = TextFormatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
     
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = []
+    if config.get('console_output', True):
+        handlers.append(logging.StreamHandler())
     
     if config.get('file'):
         log_file = Path(config['file'])
         log_file.parent.mkdir(parents=True, exist_ok=True)
         
         max_bytes = config.get('max_size_mb', 10) * 1024 * 1024
-        file_handler = logging.handlers.RotatingFileHandler(
+        handlers.append(logging.handlers.RotatingFileHandler(
             log_file,
             maxBytes=max_bytes,
-            backupCount=5
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+            backupCount=config.get('backup_count', 5)
+        ))
     
-    return logger 
\ No newline at end of file
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    if config.get('non_blocking', False):
+        # Console and file I/O (including rotation) happen on the listener thread instead of the scraper
+        front = [logging.handlers.QueueHandler(queue.SimpleQueue())]
+        _listener = logging.handlers.QueueListener(front[0].queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        front = handlers
+    
+    rate_limit = config.get('rate_limit_per_minute', 0)
+    rate_filter = RateLimitFilter(rate_limit) if rate_limit else None
+    for handler in front:
+        if rate_filter:
+            handler.addFilter(rate_filter)
+        handler.addFilter(ContextFilter())
+        root.addHandler(handler)
+        _front_handlers.append(handler)
+    
+    return logger
+
+atexit.register(stop_logging)
\ No newline at end of file
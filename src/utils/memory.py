@@ -0,0 +1,121 @@
+import ctypes
+import ctypes.util
+import gc
+import logging
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from typing import List, Optional
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_HAS_PROCFS = os.path.exists('/proc/self/statm')
+# Restarts that did not bring RSS back under budget, carried across exec
+RESTARTS_ENV = 'HOMEUS_MEMORY_RESTARTS'
+
+def rss_bytes() -> int:
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        # No procfs (macOS): fall back to the lifetime peak, which reports bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def release_free_memory() -> int:
+    collected = gc.collect()
+    libc_name = ctypes.util.find_library('c')
+    if libc_name:
+        try:
+            # glibc keeps freed arenas mapped; hand them back so RSS actually drops
+            ctypes.CDLL(libc_name).malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+    return collected
+
+class CycleMemory(threading.Thread):
+    def __init__(self, interval: float = 1.0):
+        super().__init__(name='homeus-memory', daemon=True)
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop_event = threading.Event()
+        self.peak_mb = None
+    
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+    
+    def stop(self) -> float:
+        if self.peak_mb is None:
+            self._stop_event.set()
+            if self.is_alive():
+                self.join()
+            self.peak = max(self.peak, rss_bytes())
+            self.peak_mb = round(self.peak / 1024 / 1024, 1)
+        return self.peak_mb
+
+class MemoryMonitor:
+    def __init__(self, config: dict):
+        self.rss_budget = config.get('rss_budget_mb', 0) * 1024 * 1024
+        self.restart_over_budget = config.get('restart_over_budget', True)
+        self.min_uptime = config.get('restart_min_uptime_minutes', 30) * 60
+        self.started = time.monotonic()
+        self.failed_restarts = int(os.environ.get(RESTARTS_ENV) or 0)
+        if self.rss_budget and self.restart_over_budget and not _HAS_PROCFS:
+            # The fallback is the lifetime peak, which never drops, so every restart would look like a failure
+            logging.warning("Current RSS is unavailable without /proc, restarting over budget is disabled")
+            self.restart_over_budget = False
+        self.sample_interval = config.get('sample_interval_seconds', 1)
+        self.report_top = config.get('report_top', 10)
+        self._snapshot = None
+        if config.get('tracemalloc', False) and not tracemalloc.is_tracing():
+            tracemalloc.start(config.get('tracemalloc_frames', 1))
+    
+    def start_cycle(self) -> CycleMemory:
+        tracker = CycleMemory(self.sample_interval)
+        tracker.start()
+        return tracker
+    
+    def report_growth(self) -> List[str]:
+        if not tracemalloc.is_tracing():
+            return []
+        
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            return []
+        
+        growth = [stat for stat in snapshot.compare_to(previous, 'lineno') if stat.size_diff > 0][:self.report_top]
+        lines = [f"{stat.traceback[0]}: +{stat.size_diff / 1024:.1f} KiB ({stat.count_diff:+d} blocks)" for stat in growth]
+        if lines:
+            logging.info("Memory growth since last cycle:\n  " + '\n  '.join(lines))
+        return lines
+    
+    def over_budget(self) -> Optional[float]:
+        if not self.rss_budget:
+            return None
+        rss = rss_bytes()
+        return rss / 1024 / 1024 if rss > self.rss_budget else None
+    
+    def reset_restarts(self):
+        self.failed_restarts = 0
+        os.environ.pop(RESTARTS_ENV, None)
+    
+    def restart_allowed(self) -> bool:
+        if not self.restart_over_budget:
+            return False
+        if self.failed_restarts:
+            logging.error("Memory is still over budget after a restart; not restarting again")
+            return False
+        uptime = time.monotonic() - self.started
+        if uptime < self.min_uptime:
+            logging.info(f"Up for only {uptime / 60:.0f} min, postponing the memory restart")
+            return False
+        return True
+    
+    def record_restart(self):
+        os.environ[RESTARTS_ENV] = str(self.failed_restarts + 1)
\ No newline at end of file
@@ -0,0 +1,178 @@
+import cProfile
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+def _frame_key(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+class StackSampler(threading.Thread):
+    def __init__(self, interval: float = 0.05, duration: Optional[float] = None,
+                 thread_ids: Optional[Set[int]] = None, skip_frames: Optional[Set[int]] = None,
+                 output: Optional[Path] = None):
+        super().__init__(name='homeus-sampler', daemon=True)
+        self.interval = interval
+        self.duration = duration
+        self.output = output
+        self.thread_ids = thread_ids
+        self.skip_frames = skip_frames or set()
+        self.stacks = Counter()
+        self.self_counts = Counter()
+        self.total_counts = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        deadline = time.monotonic() + self.duration if self.duration else None
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+            if deadline and time.monotonic() >= deadline:
+                break
+        
+        if self.output:
+            self.write_folded(self.output)
+            logging.info(f"Wrote {self.samples} stack samples to {self.output}")
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+    
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                continue
+            
+            keys = []
+            while frame is not None and id(frame) not in self.skip_frames:
+                keys.append(_frame_key(frame))
+                frame = frame.f_back
+            if not keys:
+                continue
+            
+            self.samples += 1
+            self.self_counts[keys[0]] += 1
+            self.total_counts.update(set(keys))
+            self.stacks[';'.join([names.get(thread_id, str(thread_id))] + keys[::-1])] += 1
+    
+    def top(self, limit: int) -> List[dict]:
+        return [
+            {
+                'function': key,
+                'self_seconds': round(count * self.interval, 3),
+                'total_seconds': round(self.total_counts[key] * self.interval, 3)
+            }
+            for key, count in self.self_counts.most_common(limit)
+        ]
+    
+    def write_folded(self, path: Path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class CycleProfile:
+    def __init__(self, profiler: 'Profiler', label: str, sampler: Optional[StackSampler], profile: Optional[cProfile.Profile]):
+        self.profiler = profiler
+        self.label = label
+        self.sampler = sampler
+        self.profile = profile
+        self.slow_functions = None
+    
+    def stop(self) -> Optional[List[dict]]:
+        if self.slow_functions is not None or (self.sampler is None and self.profile is None):
+            return self.slow_functions
+        
+        if self.profile:
+            self.profile.disable()
+        if self.sampler:
+            self.sampler.stop()
+            self.slow_functions = self.sampler.top(self.profiler.top_functions)
+        
+        if self.profile:
+            stem = self.profiler.output_path(f"cycle-{self.label}")
+            self.profile.dump_stats(f"{stem}.pstats")
+            if self.sampler:
+                self.sampler.write_folded(Path(f"{stem}.folded"))
+            logging.info(f"Wrote cycle profile to {stem}.pstats")
+        return self.slow_functions
+
+class Profiler:
+    def __init__(self, config: dict):
+        self.always_on = config.get('always_on', True)
+        self.interval = config.get('sample_interval_ms', 50) / 1000
+        self.top_functions = config.get('top_functions', 15)
+        self.signal_cycles = config.get('signal_cycles', 1)
+        self.max_sample_seconds = config.get('max_sample_seconds', 600)
+        self.signal_seconds = min(max(1, config.get('signal_sample_seconds', 30)), self.max_sample_seconds)
+        self.output_dir = Path(config.get('output_dir', 'data/profiles'))
+        self._armed_cycles = 0
+        self._sampler = None
+        # Re-entrant because the signal handlers run on the main thread, possibly while it holds the lock
+        self._lock = threading.RLock()
+    
+    def output_path(self, prefix: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir / f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+    
+    def profile_cycles(self, cycles: int) -> dict:
+        with self._lock:
+            self._armed_cycles = max(self._armed_cycles, cycles)
+        logging.info(f"Profiling the next {cycles} scraping cycles")
+        return {'profiling_cycles': cycles, 'output_dir': str(self.output_dir)}
+    
+    def sample_for(self, seconds: float) -> dict:
+        # A sampler without a deadline would never write its file and would block every later run
+        if not seconds > 0 or math.isinf(seconds):
+            raise ValueError("seconds must be a positive number")
+        seconds = min(seconds, self.max_sample_seconds)
+        with self._lock:
+            if self._sampler and self._sampler.is_alive():
+                return {'error': 'a sampling run is already in progress'}
+            path = Path(f"{self.output_path('sample')}.folded")
+            self._sampler = StackSampler(self.interval, duration=seconds, output=path)
+            self._sampler.start()
+        logging.info(f"Sampling all threads for {seconds}s")
+        return {'sampling_seconds': seconds, 'output': str(path)}
+    
+    def start_cycle(self, label) -> CycleProfile:
+        with self._lock:
+            profiled = self._armed_cycles > 0
+            if profiled:
+                self._armed_cycles -= 1
+        
+        sampler = None
+        if self.always_on or profiled:
+            # Frames above the cycle are the same in every sample, so they are left out of the stacks
+            outer = set()
+            frame = sys._getframe(1)
+            while frame is not None:
+                outer.add(id(frame))
+                frame = frame.f_back
+            sampler = StackSampler(self.interval, thread_ids={threading.get_ident()}, skip_frames=outer)
+            sampler.start()
+        
+        profile = None
+        if profiled:
+            profile = cProfile.Profile()
+            profile.enable()
+        return CycleProfile(self, str(label), sampler, profile)
+    
+    def install_signal_handlers(self):
+        if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.profile_cycles(self.signal_cycles))
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self.sample_for(self.signal_seconds))
+    
+    def handle_admin(self, params: Dict[str, str]) -> dict:
+        if 'seconds' in params:
+            return self.sample_for(float(params['seconds']))
+        return self.profile_cycles(int(params.get('cycles', self.signal_cycles)))
\ No newline at end of file
@@ -0,0 +1,32 @@
+import threading
+import time
+from collections import deque
+
+class RateLimiter:
+    def __init__(self, max_calls: int, period: float = 60.0):
+        self.max_calls = max(1, int(max_calls))
+        self.period = period
+        self._calls = deque()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+
+                if now >= self._blocked_until and len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+
+                wait = self._blocked_until - now
+                if len(self._calls) >= self.max_calls:
+                    wait = max(wait, self.period - (now - self._calls[0]))
+
+            time.sleep(max(wait, 0.01))
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
@@ -46,7 +46,7 @@ def test_scrapers():
                     print(f"  💰 Price: {sample_prop.price} {sample_prop.currency}")
                     print(f"  📍 Location: {sample_prop.location}")
                     
-                    if db.save_property(sample_prop):
+                    if db.save_property(sample_prop.to_property()):
                         print("  ✅ Database save successful")
                     else:
                         print("  ❌ Database save failed")
@@ -46,7 +46,7 @@ def test_without_sheets():
                 new_count = 0
                 for prop in properties:
                     if db.is_new_property(prop.property_id):
-                        if db.save_property(prop):
+                        if db.save_property(prop.to_property()):
                             new_count += 1
                             print(f"    ✅ New: {prop.title[:50]}... - {prop.price} {prop.currency}")
                         else: